@@ -1,8 +1,15 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import Group, User
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.forms.models import BaseInlineFormSet
+from django.template.defaultfilters import truncatechars
 
+from core.paginator import EstimatedCountPaginator
+from .constants import ADMIN_INLINE_POSTS, ADMIN_TEXT_LENGTH
 from .models import Category, Location, Post
+from .search import filter_posts
 
 admin.site.unregister(User)
 
@@ -12,25 +19,57 @@ class PostAdmin(admin.ModelAdmin):
     empty_value_display = 'Значение не выбрано.'
     list_display = (
         'is_published', 'pub_date', 'title',
-        'text', 'author', 'category', 'location'
-    )
-    list_editable = (
-        'is_published', 'pub_date',
-        'text', 'category', 'location'
+        'short_text', 'author', 'category', 'location', 'comment_count'
     )
+    # Связи в list_editable стоили бы запроса на виджет в каждой строке;
+    # они меняются на странице поста через автодополнение.
+    list_editable = ('is_published', 'pub_date')
+    list_select_related = ('author', 'category', 'location')
+    autocomplete_fields = ('author', 'category', 'location')
     search_fields = ('title', )
     list_filter = (
         'is_published', 'category',
-        'pub_date', 'author'
+        'pub_date'
     )
     list_display_links = ('title', )
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @admin.display(description='Текст')
+    def short_text(self, obj):
+        return truncatechars(obj.text, ADMIN_TEXT_LENGTH)
+
+    def get_search_results(self, request, queryset, search_term):
+        # Поиск через индекс публикаций вместо icontains по всей таблице;
+        # ранжирование списку не нужно, только отбор.
+        if not search_term:
+            return queryset, False
+        return filter_posts(queryset, search_term), False
+
+
+class LimitedInlineFormSet(BaseInlineFormSet):
+    """Формсет, показывающий только первые ``limit`` объектов."""
+
+    limit = ADMIN_INLINE_POSTS
+
+    def get_queryset(self):
+        if not hasattr(self, '_limited_queryset'):
+            self._limited_queryset = super().get_queryset()[:self.limit]
+        return self._limited_queryset
 
 
 class LocationInline(admin.TabularInline):
     model = Post
+    formset = LimitedInlineFormSet
     extra = 0
     fields = ('title', 'is_published', 'category', 'pub_date', 'location')
     readonly_fields = ('title', 'category')
+    autocomplete_fields = ('location', )
+    verbose_name_plural = (
+        f'Последние публикации (не больше {ADMIN_INLINE_POSTS})')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('category')
 
 
 @admin.register(Location)
@@ -41,24 +80,36 @@ class LocationAdmin(admin.ModelAdmin):
     list_display = (
         'name', 'is_published', 'created_at'
     )
+    search_fields = ('name', )
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    pass
+    search_fields = ('title', )
 
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     list_display = ('username', 'email', 'num_posts')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def get_inline_instances(self, request, obj=None):
         if not obj:
             return list()
         return super().get_inline_instances(request, obj)
 
+    def get_queryset(self, request):
+        # Коррелированный подзапрос считается только для строк страницы.
+        posts = (Post.objects.filter(author=OuterRef('pk')).order_by()
+                 .values('author').annotate(total=Count('pk'))
+                 .values('total'))
+        return super().get_queryset(request).annotate(num_posts=Coalesce(
+            Subquery(posts, output_field=IntegerField()), 0))
+
+    @admin.display(description='Публикации', ordering='num_posts')
     def num_posts(self, obj):
-        return obj.author_posts.count()
+        return obj.num_posts
 
 
 admin.site.unregister(Group)
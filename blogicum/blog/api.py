@@ -0,0 +1,230 @@
+from functools import wraps
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.views.decorators.http import require_safe
+
+from core.paginator import InvalidCursor, KeysetPaginator
+from core.routers import replica_reads
+from .conditional import conditional_feed, conditional_post
+from .constants import AMOUNT_COMMENTS, AMOUNT_POSTS, API_MAX_LIMIT
+from .models import Category, Comment, Post
+from .profiles import author_post_count, get_profile, profile_feed
+
+
+class ApiError(ValueError):
+    pass
+
+
+class Fieldset:
+    """
+    Публичные поля ресурса и их источники в ORM.
+
+    Запрошенные через ``?fields=`` поля превращаются в ``values()``:
+    из БД читаются только нужные столбцы, а строки сериализуются
+    как словари без создания моделей. Поля порядка (для курсора)
+    выбираются всегда, но в ответ попадают, только если запрошены.
+    """
+
+    def __init__(self, sources, default, required=(), converters=None):
+        self.sources = sources
+        self.default = tuple(default)
+        self.required = tuple(required)
+        self.converters = converters or {}
+
+    def parse(self, value, default=None):
+        if not value:
+            return default or self.default
+        names = tuple(dict.fromkeys(
+            name.strip() for name in value.split(',') if name.strip()))
+        unknown = [name for name in names if name not in self.sources]
+        if unknown or not names:
+            raise ApiError(
+                f'Неизвестные поля: {", ".join(unknown) or value}. '
+                f'Доступны: {", ".join(self.sources)}')
+        return names
+
+    def select(self, queryset, names):
+        selected = dict.fromkeys((*names, *self.required))
+        plain = [self.sources[name] for name in selected
+                 if self.sources[name] == name]
+        # Поля связанных моделей выбираются под служебными именами:
+        # имя ``author`` занято внешним ключом.
+        related = {f'_{name}': F(self.sources[name]) for name in selected
+                   if self.sources[name] != name}
+        return queryset.values(*plain, **related)
+
+    def serialize(self, row, names):
+        result = {}
+        for name in names:
+            value = row[name if self.sources[name] == name else f'_{name}']
+            converter = self.converters.get(name)
+            result[name] = converter(value) if converter else value
+        return result
+
+
+def _image_url(name):
+    return Post.image.field.storage.url(name) if name else None
+
+
+POST_FIELDS = Fieldset(
+    sources={
+        'id': 'id',
+        'title': 'title',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'updated_at': 'updated_at',
+        'is_published': 'is_published',
+        'comment_count': 'comment_count',
+        'image': 'image',
+        'author': 'author__username',
+        'category': 'category__slug',
+        'location': 'location__name',
+    },
+    default=('id', 'title', 'pub_date', 'author', 'category', 'location',
+             'comment_count', 'image'),
+    required=('id', 'pub_date'),
+    converters={'image': _image_url},
+)
+POST_DETAIL_FIELDS = (*POST_FIELDS.default, 'text', 'updated_at')
+COMMENT_FIELDS = Fieldset(
+    sources={
+        'id': 'id',
+        'text': 'text',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+        'author': 'author__username',
+    },
+    default=('id', 'text', 'created_at', 'author'),
+    required=('id', 'created_at'),
+)
+
+
+def api_view(view_func):
+    """GET/HEAD-представление API: ошибки отдаются в JSON."""
+    @require_safe
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        try:
+            return view_func(request, *args, **kwargs)
+        except Http404:
+            return JsonResponse({'error': 'Не найдено'}, status=404)
+        except ApiError as error:
+            return JsonResponse({'error': str(error)}, status=400)
+    return _wrapped_view
+
+
+def _limit(request, default):
+    value = request.GET.get('limit')
+    if not value:
+        return default
+    error = ApiError(f'limit — целое число от 1 до {API_MAX_LIMIT}')
+    try:
+        limit = int(value)
+    except ValueError:
+        raise error
+    if not 0 < limit <= API_MAX_LIMIT:
+        raise error
+    return limit
+
+
+def _json(data):
+    return JsonResponse(
+        data, encoder=DjangoJSONEncoder,
+        json_dumps_params={'ensure_ascii': False, 'separators': (',', ':')})
+
+
+def _page(request, queryset, fieldset, ordering, default_limit):
+    names = fieldset.parse(request.GET.get('fields'))
+    paginator = KeysetPaginator(
+        fieldset.select(queryset, names),
+        _limit(request, default_limit), ordering)
+    try:
+        page = paginator.page(request.GET.get('cursor'))
+    except InvalidCursor as error:
+        raise ApiError(str(error))
+    return {
+        'results': [fieldset.serialize(row, names) for row in page],
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    }
+
+
+def _post_list(request, queryset):
+    return _json(_page(request, queryset, POST_FIELDS,
+                       ('-pub_date', '-id'), AMOUNT_POSTS))
+
+
+@replica_reads
+@api_view
+@conditional_feed
+def post_list(request):
+    return _post_list(request, Post.objects.posts_published())
+
+
+@replica_reads
+@api_view
+@conditional_feed
+def category_post_list(request, category_slug):
+    category = get_object_or_404(
+        Category, slug=category_slug, is_published=True)
+    return _post_list(
+        request, Post.objects.posts_published().filter(category=category))
+
+
+@replica_reads
+@api_view
+@conditional_feed
+def profile_post_list(request, username):
+    _, posts, _ = profile_feed(request.user, username)
+    return _post_list(request, posts)
+
+
+@replica_reads
+@api_view
+@conditional_feed
+def profile_detail(request, username):
+    profile = get_profile(username)
+    own = request.user.is_authenticated and request.user.pk == profile.pk
+    return _json({
+        'username': profile.username,
+        'full_name': profile.get_full_name(),
+        'date_joined': profile.date_joined,
+        'is_staff': profile.is_staff,
+        'post_count': author_post_count(profile, own),
+    })
+
+
+def _readable_posts(request):
+    """Посты, которые видит пользователь: опубликованные и свои."""
+    visible = Q(is_published=True, category__is_published=True,
+                pub_date__lte=timezone.now())
+    if request.user.is_authenticated:
+        visible |= Q(author=request.user)
+    return Post.objects.filter(visible, category__isnull=False)
+
+
+@replica_reads
+@api_view
+@conditional_post
+def post_detail(request, post_id):
+    names = POST_FIELDS.parse(request.GET.get('fields'), POST_DETAIL_FIELDS)
+    row = POST_FIELDS.select(
+        _readable_posts(request).filter(pk=post_id), names).first()
+    if row is None:
+        raise Http404
+    return _json(POST_FIELDS.serialize(row, names))
+
+
+@replica_reads
+@api_view
+@conditional_post
+def post_comments(request, post_id):
+    if not _readable_posts(request).filter(pk=post_id).exists():
+        raise Http404
+    return _json(_page(
+        request, Comment.objects.filter(post_id=post_id), COMMENT_FIELDS,
+        ('created_at', 'id'), AMOUNT_COMMENTS))
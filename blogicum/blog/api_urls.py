@@ -0,0 +1,32 @@
+from django.urls import path
+
+from . import api
+
+app_name = 'api'
+
+urlpatterns = [
+    path(
+        'posts/',
+        api.post_list,
+        name='post_list'),
+    path(
+        'posts/<int:post_id>/',
+        api.post_detail,
+        name='post_detail'),
+    path(
+        'posts/<int:post_id>/comments/',
+        api.post_comments,
+        name='post_comments'),
+    path(
+        'categories/<slug:category_slug>/posts/',
+        api.category_post_list,
+        name='category_post_list'),
+    path(
+        'profiles/<str:username>/',
+        api.profile_detail,
+        name='profile_detail'),
+    path(
+        'profiles/<str:username>/posts/',
+        api.profile_post_list,
+        name='profile_post_list'),
+]
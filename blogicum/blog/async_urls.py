@@ -0,0 +1,19 @@
+from django.urls import path
+
+from . import async_views, urls
+
+app_name = 'blog'
+
+ASYNC_VIEWS = {
+    'index': async_views.index,
+    'category_posts': async_views.category_posts,
+    'profile': async_views.profile,
+    'post_detail': async_views.post_detail,
+}
+
+# Те же маршруты, что в blog.urls; читающие страницы — асинхронные.
+urlpatterns = [
+    path(str(pattern.pattern), ASYNC_VIEWS[pattern.name], name=pattern.name)
+    if pattern.name in ASYNC_VIEWS else pattern
+    for pattern in urls.urlpatterns
+]
@@ -0,0 +1,84 @@
+"""
+Асинхронные варианты читающих страниц для запуска под ASGI.
+
+Страницы и шаблоны те же, что в ``blog.views``; данные загружаются
+через ``core.asyncdb``: асинхронной итерацией ORM, если она есть,
+иначе в ограниченном пуле потоков, так что ожидание БД не занимает
+цикл событий. Подключаются через ``blog.async_urls``.
+"""
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+
+from core.asyncdb import fetch, run_sync
+from core.paginator import paginate
+from core.routers import replica_reads
+from .cache import cache_feed
+from .conditional import conditional_feed, conditional_post
+from .constants import AMOUNT_POSTS
+from .forms import CommentForm
+from .models import Category, Post
+from .profiles import profile_feed
+from .views import get_comments_page, get_post_for_reader
+
+
+async def _feed_page(request, posts, count=None):
+    _, page_obj = await run_sync(paginate)(
+        request, posts, AMOUNT_POSTS, count)
+    page_obj.object_list = await fetch(page_obj.object_list)
+    return page_obj
+
+
+def _published_category(category_slug):
+    return get_object_or_404(
+        Category, slug=category_slug, is_published=True)
+
+
+@replica_reads
+@conditional_feed
+@cache_feed
+async def index(request):
+    posts = Post.objects.posts_published().posts_annotate()
+    return TemplateResponse(request, 'blog/index.html', {
+        'page_obj': await _feed_page(request, posts),
+    })
+
+
+@replica_reads
+@conditional_feed
+@cache_feed
+async def category_posts(request, category_slug):
+    category = await run_sync(_published_category)(category_slug)
+    posts = (Post.objects
+             .posts_published()
+             .posts_annotate()
+             .filter(category=category))
+    return TemplateResponse(request, 'blog/category.html', {
+        'category': category,
+        'page_obj': await _feed_page(request, posts),
+    })
+
+
+@replica_reads
+@conditional_feed
+@cache_feed
+async def profile(request, username):
+    profile, posts, post_count = await run_sync(profile_feed)(
+        request.user, username)
+    return TemplateResponse(request, 'blog/profile.html', {
+        'profile': profile,
+        'post_count': post_count,
+        'page_obj': await _feed_page(request, posts, post_count),
+    })
+
+
+@replica_reads
+@conditional_post
+async def post_detail(request, post_id):
+    post = await run_sync(get_post_for_reader)(request, post_id)
+    comments = await run_sync(get_comments_page)(request, post)
+    comments.object_list = await fetch(comments.object_list)
+    return TemplateResponse(request, 'blog/detail.html', {
+        'post': post,
+        'form': CommentForm(),
+        'comments': comments,
+    })
@@ -0,0 +1,407 @@
+import asyncio
+import queue
+import random
+import statistics
+import subprocess
+import threading
+from datetime import timedelta
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Category, Comment, Location, Post
+from .search import get_backend
+
+User = get_user_model()
+
+PREFIX = 'bench'
+BATCH_SIZE = 5000
+HOST = 'localhost'
+# Значения SQLite по умолчанию: журнал отката, полная синхронизация.
+SQLITE_DEVELOPMENT_DATABASE = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'CONN_MAX_AGE': 0,
+    'TRANSACTION_MODE': None,
+    'PRAGMAS': {'journal_mode': 'delete', 'synchronous': 'full'},
+}
+
+
+def _batched_create(model, objects, batch_size=BATCH_SIZE):
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) == batch_size:
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+
+
+def _ids(queryset):
+    return list(queryset.order_by('id').values_list('id', flat=True))
+
+
+def seed(users, posts, comments, seed=0, log=print):
+    """
+    Наполняет БД синтетическими данными для бенчмарка.
+
+    Генерация детерминирована (``seed``), записи вставляются пачками
+    через ``bulk_create``; ``Post.comment_count`` заполняется сразу.
+    """
+    rnd = random.Random(seed)
+    now = timezone.now()
+    password = make_password(PREFIX)
+
+    log(f'Пользователи: {users}')
+    _batched_create(User, (
+        User(username=f'{PREFIX}_user_{i}', password=password)
+        for i in range(users)))
+    user_ids = _ids(User.objects.filter(username__startswith=PREFIX))
+
+    categories = [
+        Category(title=f'{PREFIX} {i}', description=PREFIX,
+                 slug=f'{PREFIX}-{i}')
+        for i in range(20)]
+    Category.objects.bulk_create(categories)
+    category_ids = _ids(Category.objects.filter(slug__startswith=PREFIX))
+    Location.objects.bulk_create(
+        Location(name=f'{PREFIX} {i}') for i in range(50))
+    location_ids = _ids(Location.objects.filter(name__startswith=PREFIX))
+
+    log(f'Комментарии на пост: распределение {comments} по {posts}')
+    counts = [0] * posts
+    targets = [rnd.randrange(posts) for _ in range(comments)]
+    for index in targets:
+        counts[index] += 1
+
+    log(f'Публикации: {posts}')
+    first_post_id = (Post.objects.order_by('-id')
+                     .values_list('id', flat=True).first() or 0)
+    _batched_create(Post, (
+        Post(
+            title=f'{PREFIX} post {i}',
+            text=' '.join(f'слово{rnd.randrange(1000)}' for _ in range(60)),
+            pub_date=now - timedelta(minutes=rnd.randrange(3 * 365 * 1440)),
+            author_id=rnd.choice(user_ids),
+            category_id=rnd.choice(category_ids),
+            location_id=rnd.choice(location_ids),
+            comment_count=counts[i],
+        )
+        for i in range(posts)))
+    post_ids = _ids(Post.objects.filter(id__gt=first_post_id))
+
+    log(f'Комментарии: {comments}')
+    _batched_create(Comment, (
+        Comment(
+            post_id=post_ids[index],
+            author_id=rnd.choice(user_ids),
+            text=f'{PREFIX} comment {rnd.randrange(10 ** 6)}',
+        )
+        for index in targets))
+
+    log('Поисковый индекс')
+    get_backend().rebuild()
+    return {'users': users, 'posts': posts, 'comments': comments,
+            'seed': seed}
+
+
+def _percentile(samples, percent):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def _measure(name, request, count):
+    samples = []
+    for i in range(count):
+        started = perf_counter()
+        response = request(i)
+        samples.append(perf_counter() - started)
+        if response.status_code >= 400:
+            raise RuntimeError(
+                f'{name}: ответ {response.status_code} на запрос {i}')
+    total = sum(samples)
+    return {
+        'requests': count,
+        'rps': round(count / total, 2) if total else None,
+        'mean_ms': round(statistics.mean(samples) * 1000, 3),
+        'p50_ms': round(_percentile(samples, 50) * 1000, 3),
+        'p99_ms': round(_percentile(samples, 99) * 1000, 3),
+    }
+
+
+def scenarios(rnd):
+    """Сценарии: имя -> функция (client, номер запроса) -> response."""
+    post_ids = _ids(Post.objects.posts_published())
+    categories = Category.objects.filter(is_published=True)
+    slugs = list(categories.values_list('slug', flat=True))
+    category_ids = _ids(categories)
+    usernames = list(User.objects.filter(author_posts__isnull=False)
+                     .values_list('username', flat=True).distinct()[:1000])
+    deep_pages = max(1, len(post_ids) // 10)
+
+    def feed_page():
+        return {'page': rnd.randint(1, deep_pages)}
+
+    return {
+        'index': lambda c, i: c.get(reverse('blog:index'), feed_page()),
+        'category': lambda c, i: c.get(reverse(
+            'blog:category_posts', args=[rnd.choice(slugs)]),
+            {'page': rnd.randint(1, 5)}),
+        'profile': lambda c, i: c.get(reverse(
+            'blog:profile', args=[rnd.choice(usernames)]),
+            {'page': rnd.randint(1, 3)}),
+        'detail': lambda c, i: c.get(reverse(
+            'blog:post_detail', args=[rnd.choice(post_ids)])),
+        'search': lambda c, i: c.get(reverse('blog:search'), {
+            'q': f'слово{rnd.randrange(1000)} слово{rnd.randrange(1000)}'}),
+        'comment_create': lambda c, i: c.post(reverse(
+            'blog:add_comment', args=[rnd.choice(post_ids)]),
+            {'text': f'{PREFIX} benchmark comment {i}'}),
+        'post_create': lambda c, i: c.post(reverse('blog:create_post'), {
+            'title': f'{PREFIX} new post {i}',
+            'text': PREFIX,
+            'pub_date': timezone.localtime().strftime('%Y-%m-%dT%H:%M'),
+            'category': rnd.choice(category_ids),
+        }),
+    }
+
+
+def run(requests, only=None, seed=0, anonymous=False, log=print):
+    """
+    Прогоняет сценарии через тестовый клиент Django.
+
+    По умолчанию запросы идут от пользователя: страничный кэш анонимов
+    не маскирует стоимость запросов к БД. ``anonymous`` измеряет ленты
+    так, как их видит гость (с кэшем страниц).
+    """
+    rnd = random.Random(seed)
+    user = User.objects.filter(username__startswith=PREFIX).first()
+    client = Client(HTTP_HOST=HOST)
+    if not anonymous and user is not None:
+        client.force_login(user)
+
+    results = {}
+    for name, request in scenarios(rnd).items():
+        if only and name not in only:
+            continue
+        if anonymous and name in ('comment_create', 'post_create'):
+            continue
+        log(f'{name}: {requests} запросов')
+        results[name] = _measure(
+            name, lambda i, request=request: request(client, i), requests)
+    return results
+
+
+def use_database_profile(profile, using=DEFAULT_DB_ALIAS):
+    """
+    Переключает базу на профиль ``development`` или ``production``
+    (см. ``DATABASE_PROFILE`` в настройках) для соединений, открытых
+    после вызова. Режим журнала хранится в файле БД, поэтому для
+    ``development`` он явно возвращается к ``delete``.
+    """
+    connections.close_all()
+    connections.databases[using].update(
+        settings.SQLITE_PRODUCTION_DATABASE if profile == 'production'
+        else SQLITE_DEVELOPMENT_DATABASE)
+    # Новое соединение сразу переключает режим журнала в файле БД.
+    connections[using].ensure_connection()
+
+
+def _summary(samples, errors, duration):
+    if not samples:
+        return {'ops': 0, 'ops_per_s': 0, 'errors': errors}
+    return {
+        'ops': len(samples),
+        'ops_per_s': round(len(samples) / duration, 2),
+        'p50_ms': round(_percentile(samples, 50) * 1000, 3),
+        'p99_ms': round(_percentile(samples, 99) * 1000, 3),
+        'errors': errors,
+    }
+
+
+def run_concurrent(duration, readers, writers, seed=0, log=print):
+    """
+    Смешанная нагрузка из потоков: читатели открывают страницы постов,
+    писатели добавляют комментарии, пока не истечёт ``duration`` секунд.
+
+    Ошибкой считается ответ 4xx/5xx — в том числе «database is locked»,
+    когда писатель не дождался блокировки. Потоки делят один GIL,
+    поэтому важны не абсолютные числа, а сравнение профилей БД.
+    """
+    post_ids = _ids(Post.objects.posts_published())
+    user = User.objects.filter(username__startswith=PREFIX).first()
+    if not post_ids or user is None:
+        raise RuntimeError('нет данных для нагрузки')
+
+    results = {'read': ([], [0]), 'write': ([], [0])}
+    lock = threading.Lock()
+    deadline = perf_counter() + duration
+
+    def worker(kind, number):
+        rnd = random.Random(seed * 1000 + number)
+        client = Client(HTTP_HOST=HOST, raise_request_exception=False)
+        client.force_login(user)
+        samples, errors = [], 0
+        try:
+            while perf_counter() < deadline:
+                post_id = rnd.choice(post_ids)
+                started = perf_counter()
+                if kind == 'write':
+                    response = client.post(
+                        reverse('blog:add_comment', args=[post_id]),
+                        {'text': f'{PREFIX} concurrent comment {number}'})
+                else:
+                    response = client.get(
+                        reverse('blog:post_detail', args=[post_id]))
+                if response.status_code >= 400:
+                    errors += 1
+                else:
+                    samples.append(perf_counter() - started)
+        finally:
+            connections.close_all()
+        with lock:
+            results[kind][0].extend(samples)
+            results[kind][1][0] += errors
+
+    log(f'{readers} читателей, {writers} писателей, {duration} с')
+    threads = [threading.Thread(target=worker, args=('read', i))
+               for i in range(readers)]
+    threads += [threading.Thread(target=worker, args=('write', readers + i))
+                for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {kind: _summary(samples, errors[0], duration)
+            for kind, (samples, errors) in results.items()}
+
+
+def _read_paths(requests, rnd):
+    post_ids = _ids(Post.objects.posts_published())
+    slugs = list(Category.objects.filter(is_published=True)
+                 .values_list('slug', flat=True))
+    usernames = list(User.objects.filter(author_posts__isnull=False)
+                     .values_list('username', flat=True).distinct()[:1000])
+    if not post_ids or not slugs or not usernames:
+        raise RuntimeError('нет данных для нагрузки')
+    pages = (
+        lambda: reverse('blog:index'),
+        lambda: reverse('blog:category_posts', args=[rnd.choice(slugs)]),
+        lambda: reverse('blog:profile', args=[rnd.choice(usernames)]),
+        lambda: reverse('blog:post_detail', args=[rnd.choice(post_ids)]),
+    )
+    return [rnd.choice(pages)() for _ in range(requests)]
+
+
+def _run_wsgi(paths, concurrency, cookies):
+    pending = queue.SimpleQueue()
+    for path in paths:
+        pending.put(path)
+    samples, errors = [], [0]
+    lock = threading.Lock()
+
+    def worker():
+        client = Client(HTTP_HOST=HOST, raise_request_exception=False)
+        client.cookies.update(cookies)
+        own_samples, own_errors = [], 0
+        try:
+            while True:
+                try:
+                    path = pending.get_nowait()
+                except queue.Empty:
+                    break
+                started = perf_counter()
+                response = client.get(path)
+                if response.status_code >= 400:
+                    own_errors += 1
+                else:
+                    own_samples.append(perf_counter() - started)
+        finally:
+            connections.close_all()
+        with lock:
+            samples.extend(own_samples)
+            errors[0] += own_errors
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return _summary(samples, errors[0], perf_counter() - started)
+
+
+def _run_asgi(paths, concurrency, cookies):
+    client = AsyncClient(raise_request_exception=False)
+    client.cookies.update(cookies)
+
+    async def drive():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def get(path):
+            async with semaphore:
+                started = perf_counter()
+                response = await client.get(path)
+                return perf_counter() - started, response.status_code
+
+        return await asyncio.gather(*(get(path) for path in paths))
+
+    started = perf_counter()
+    outcomes = asyncio.run(drive())
+    duration = perf_counter() - started
+    samples = [elapsed for elapsed, status in outcomes if status < 400]
+    return _summary(samples, len(outcomes) - len(samples), duration)
+
+
+def run_server_comparison(requests, concurrency, workers=None, seed=0,
+                          log=print):
+    """
+    Пропускная способность читающих страниц (лента, категория, профиль,
+    пост) под WSGI и под ASGI при ``concurrency`` одновременных
+    запросах от пользователя (страничный кэш анонимов не участвует).
+
+    WSGI — синхронные представления в ``concurrency`` потоках; ASGI —
+    асинхронные (``blogicum.asgi_urls``) в одном цикле событий, БД —
+    в пуле ``workers`` потоков (по умолчанию ``ASYNC_DB_WORKERS``).
+    Обе стороны получают одинаковую последовательность URL.
+    """
+    user = User.objects.filter(username__startswith=PREFIX).first()
+    if user is None:
+        raise RuntimeError('нет данных для нагрузки')
+    paths = _read_paths(requests, random.Random(seed))
+    login = Client(HTTP_HOST=HOST)
+    login.force_login(user)
+
+    workers = workers or settings.ASYNC_DB_WORKERS
+    results = {}
+    log(f'WSGI: {requests} запросов, {concurrency} потоков')
+    with override_settings(ROOT_URLCONF='blogicum.urls'):
+        results['wsgi'] = _run_wsgi(paths, concurrency, login.cookies)
+    log(f'ASGI: {requests} запросов, {concurrency} одновременно, '
+        f'{workers} потоков БД')
+    # AsyncClient в Django 3.2 всегда шлёт Host: testserver.
+    with override_settings(ROOT_URLCONF='blogicum.asgi_urls',
+                           ASYNC_DB_WORKERS=workers,
+                           ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS,
+                                          'testserver']):
+        results['asgi'] = _run_asgi(paths, concurrency, login.cookies)
+    connections.close_all()
+    return results
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', 'HEAD'), capture_output=True, text=True,
+            check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
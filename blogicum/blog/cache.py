@@ -0,0 +1,90 @@
+import asyncio
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+
+from core.asyncdb import run_sync
+from core.cache import (PAGE_HITS, PAGE_MISSES, bump_version,
+                        cache_anonymous_page, get_counters, get_versions,
+                        incr_counter)
+from .publication import refresh_horizon, seconds_until_horizon
+
+POST_CARD_TEMPLATE = 'includes/post_card.html'
+POST_CARDS = 'post_cards'
+CARD_HITS = 'post_card_hits'
+CARD_MISSES = 'post_card_misses'
+FEEDS = 'feeds'
+
+
+def post_version_name(post_id):
+    return f'post:{post_id}'
+
+
+def render_post_card(post):
+    """
+    Карточка поста из кэша фрагментов.
+
+    Карточка не зависит от зрителя, поэтому ключ строится только из id
+    поста, его версии и общего поколения карточек (категории, локации,
+    авторы показываются во всех карточках сразу).
+    """
+    generation, version = get_versions(
+        POST_CARDS, post_version_name(post.pk))
+    key = f'{POST_CARDS}:{generation}:{post.pk}:{version}'
+    html = cache.get(key)
+    if html is not None:
+        incr_counter(CARD_HITS)
+        return html
+    incr_counter(CARD_MISSES)
+    html = render_to_string(POST_CARD_TEMPLATE, {'post': post})
+    cache.set(key, html, settings.POST_CARD_CACHE_TIMEOUT)
+    return html
+
+
+def invalidate_post_card(post_id):
+    bump_version(post_version_name(post_id))
+
+
+def invalidate_post_cards():
+    bump_version(POST_CARDS)
+
+
+def post_card_stats():
+    return get_counters(CARD_HITS, CARD_MISSES)
+
+
+def invalidate_feeds():
+    bump_version(FEEDS)
+
+
+def feed_cache_timeout():
+    """
+    Страница ленты живёт не дольше ``FEED_CACHE_TIMEOUT`` и не дольше
+    горизонта публикаций, чтобы отложенный пост появился вовремя.
+    """
+    return seconds_until_horizon(settings.FEED_CACHE_TIMEOUT)
+
+
+def cache_feed(view_func):
+    cached_view = cache_anonymous_page(
+        (FEEDS, ), feed_cache_timeout)(view_func)
+
+    if asyncio.iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _async_view(request, *args, **kwargs):
+            await run_sync(refresh_horizon)()
+            return await cached_view(request, *args, **kwargs)
+        return _async_view
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        # Наступивший горизонт сбрасывает поколение лент до поиска в кэше.
+        refresh_horizon()
+        return cached_view(request, *args, **kwargs)
+    return _wrapped_view
+
+
+def page_cache_stats():
+    return get_counters(PAGE_HITS, PAGE_MISSES)
@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max, OuterRef, Subquery
+from django.utils import timezone
+
+from core.cache import conditional_page, get_versions
+from core.db import select_values
+from .cache import FEEDS, POST_CARDS, feed_cache_timeout, post_version_name
+from .models import Category, Comment, Location, Post
+from .publication import refresh_horizon
+
+FEEDS_LAST_MODIFIED = 'feeds_last_modified'
+POST_LAST_MODIFIED = 'post_last_modified'
+
+
+def _latest(*moments):
+    moments = [moment for moment in moments if moment is not None]
+    return max(moments) if moments else None
+
+
+def _newest(queryset, field):
+    return Subquery(queryset.order_by(f'-{field}').values(field)[:1])
+
+
+def feeds_last_modified(request, *args, **kwargs):
+    """
+    Время последнего изменения лент: изменения постов, категорий
+    и локаций и последняя наступившая публикация (отложенный пост
+    появляется без записи в БД).
+
+    Агрегаты пересчитываются один раз на поколение лент и хранятся
+    в кэше под ним, поэтому условный запрос обычно не трогает БД.
+    """
+    version, = get_versions(FEEDS)
+    key = f'{FEEDS_LAST_MODIFIED}:{version}'
+    stored = cache.get(key)
+    if stored is None:
+        published = Post.objects.filter(
+            is_published=True, pub_date__lte=timezone.now())
+        # Четыре индексируемых подзапроса в одном SELECT без таблицы:
+        # пустая таблица постов не теряет изменения категорий и локаций.
+        row = select_values(
+            Post.objects.db,
+            posts=_newest(Post.objects.all(), 'updated_at'),
+            published=_newest(published, 'pub_date'),
+            categories=_newest(Category.objects.all(), 'updated_at'),
+            locations=_newest(Location.objects.all(), 'updated_at'))
+        stored = (_latest(*row.values()), )
+        cache.set(key, stored, feed_cache_timeout())
+    return stored[0]
+
+
+def feed_version_names(request, *args, **kwargs):
+    # Вызывается до чтения версий для любого зрителя: наступившая
+    # отложенная публикация должна сбросить поколение лент раньше,
+    # чем из него построят ETag.
+    refresh_horizon()
+    return (FEEDS, )
+
+
+def post_last_modified(request, post_id, **kwargs):
+    """
+    Время последнего изменения страницы поста: пост, его категория
+    и локация и последний изменённый комментарий — одним запросом,
+    результат хранится в кэше под версиями страницы. Удаление
+    комментария меняет счётчик, а с ним и ``updated_at`` поста.
+    """
+    versions = get_versions(*post_version_names(request, post_id))
+    key = f'{POST_LAST_MODIFIED}:{post_id}:{":".join(map(str, versions))}'
+    stored = cache.get(key)
+    if stored is None:
+        comments = (Comment.objects.filter(post=OuterRef('pk')).order_by()
+                    .values('post').annotate(latest=Max('updated_at'))
+                    .values('latest'))
+        row = (Post.objects.filter(pk=post_id).order_by()
+               .annotate(comments_updated_at=Subquery(comments))
+               .values_list('updated_at', 'category__updated_at',
+                            'location__updated_at', 'comments_updated_at')
+               .first())
+        stored = (_latest(*row) if row else None, )
+        cache.set(key, stored, settings.POST_CARD_CACHE_TIMEOUT)
+    return stored[0]
+
+
+def post_version_names(request, post_id, **kwargs):
+    return (POST_CARDS, post_version_name(post_id))
+
+
+conditional_feed = conditional_page(feeds_last_modified, feed_version_names)
+conditional_post = conditional_page(post_last_modified, post_version_names)
@@ -1,3 +1,10 @@
 TITLE_FIELD_LENGTH = 256
 DISPLAY_LENGTH = 120
 AMOUNT_POSTS = 10
+AMOUNT_COMMENTS = 50
+IMAGE_WIDTHS = (320, 640, 1280)
+IMAGE_QUALITY = 80
+ADMIN_TEXT_LENGTH = 60
+ADMIN_INLINE_POSTS = 20
+AMOUNT_FEED_ITEMS = 20
+API_MAX_LIMIT = 100
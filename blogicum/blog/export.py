@@ -0,0 +1,100 @@
+import json
+from datetime import datetime, time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Category, Comment, Location, Post
+
+# Порядок выгрузки учитывает зависимости: при загрузке через
+# fast_loaddata ссылки указывают на уже загруженные записи.
+EXPORT_MODELS = (Category, Location, Post, Comment)
+CHUNK_SIZE = 2000
+
+
+class InvalidExportParameter(ValueError):
+    pass
+
+
+def parse_since(value):
+    if not value:
+        return None
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            moment = day and datetime.combine(day, time.min)
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise InvalidExportParameter(f'Некорректная дата: {value}')
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def parse_cursor(value):
+    """Курсор ``app_label.model:pk`` — последняя выгруженная запись."""
+    if not value:
+        return None
+    label, _, pk = value.rpartition(':')
+    labels = [model._meta.label_lower for model in EXPORT_MODELS]
+    if label not in labels or not pk.isdigit():
+        raise InvalidExportParameter(f'Некорректный курсор: {value}')
+    return labels.index(label), int(pk)
+
+
+def make_cursor(model, pk):
+    return f'{model._meta.label_lower}:{pk}'
+
+
+def _export_model(model, since, changed_since, after_pk, chunk_size):
+    fields = [field for field in model._meta.concrete_fields
+              if not field.primary_key]
+    attnames = [field.attname for field in fields]
+    names = [field.name for field in fields]
+    label = model._meta.label_lower
+
+    queryset = model._default_manager.all()
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+    if changed_since is not None:
+        queryset = queryset.changed_since(changed_since)
+    queryset = queryset.order_by('pk')
+    if after_pk is not None:
+        queryset = queryset.filter(pk__gt=after_pk)
+    rows = queryset.values_list('pk', *attnames).iterator(
+        chunk_size=chunk_size)
+    for pk, *values in rows:
+        yield model, pk, {'model': label, 'pk': pk,
+                          'fields': dict(zip(names, values))}
+
+
+def iter_export(since=None, cursor=None, chunk_size=CHUNK_SIZE,
+                changed_since=None):
+    """
+    Выгружает Category, Location, Post и Comment как записи формата
+    фикстур Django: ``(model, pk, record)``.
+
+    Каждая модель читается по возрастанию pk через ``.iterator()``,
+    поэтому память не растёт с объёмом, а выгрузку можно продолжить
+    с курсора последней записи. ``since`` ограничивает выгрузку
+    записями с ``created_at`` не раньше указанного момента,
+    ``changed_since`` — изменёнными (``updated_at``) начиная с него:
+    инкрементальная выгрузка вместо полной. Пользователи (с хешами
+    паролей) не выгружаются — ссылки на авторов остаются id.
+    """
+    start, after_pk = cursor if cursor else (0, None)
+    for position, model in enumerate(EXPORT_MODELS[start:], start):
+        yield from _export_model(
+            model, since, changed_since,
+            after_pk if position == start else None, chunk_size)
+
+
+def iter_ndjson(since=None, cursor=None, chunk_size=CHUNK_SIZE,
+                changed_since=None):
+    for _, _, record in iter_export(
+            since, cursor, chunk_size, changed_since):
+        yield json.dumps(record, cls=DjangoJSONEncoder,
+                         ensure_ascii=False) + '\n'
@@ -0,0 +1,121 @@
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+
+from core.routers import replica_reads
+from .cache import cache_feed
+from .conditional import conditional_feed
+from .constants import AMOUNT_FEED_ITEMS
+from .models import Category, Post
+from .profiles import get_profile
+
+SITE_TITLE = 'Блогикум'
+
+
+class PostFeed(Feed):
+    """
+    Лента последних опубликованных постов.
+
+    Элементы строятся из одного запроса с автором и категорией;
+    дата публикации и ``updated_at`` дают ``pubDate``/``updated``.
+    """
+
+    title = SITE_TITLE
+    description = 'Новые публикации'
+
+    def link(self, obj=None):
+        return reverse('blog:index')
+
+    def get_posts(self, obj):
+        return Post.objects.posts_published()
+
+    def items(self, obj=None):
+        return (self.get_posts(obj)
+                .select_related('author', 'category')
+                .order_by('-pub_date', '-id')[:AMOUNT_FEED_ITEMS])
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.text
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_author_link(self, item):
+        return reverse('blog:profile', args=[item.author.username])
+
+    def item_categories(self, item):
+        return (item.category.title, )
+
+
+class CategoryPostFeed(PostFeed):
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True)
+
+    def title(self, obj):
+        return f'{SITE_TITLE}: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=[obj.slug])
+
+    def get_posts(self, obj):
+        return super().get_posts(obj).filter(category=obj)
+
+
+class AuthorPostFeed(PostFeed):
+
+    def get_object(self, request, username):
+        return get_profile(username)
+
+    def title(self, obj):
+        return f'{SITE_TITLE}: {obj.username}'
+
+    def description(self, obj):
+        return f'Публикации пользователя {obj.username}'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=[obj.username])
+
+    def get_posts(self, obj):
+        return super().get_posts(obj).filter(author=obj)
+
+
+class AtomFeedMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj=None):
+        return self._get_dynamic_attr('description', obj)
+
+
+class AtomPostFeed(AtomFeedMixin, PostFeed):
+    pass
+
+
+class AtomCategoryPostFeed(AtomFeedMixin, CategoryPostFeed):
+    pass
+
+
+class AtomAuthorPostFeed(AtomFeedMixin, AuthorPostFeed):
+    pass
+
+
+def feed_view(feed_class):
+    """
+    Представление ленты: 304 по ETag/Last-Modified и страничный кэш
+    до следующего изменения или горизонта отложенных публикаций.
+    """
+    return replica_reads(conditional_feed(cache_feed(feed_class())))
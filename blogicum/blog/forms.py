@@ -1,8 +1,12 @@
+from functools import partial
+
 from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserChangeForm
+from django.db import transaction
 from django.utils import timezone
 
+from .images import process_post_image, release_image
 from .models import Comment, Post
 
 User = get_user_model()
@@ -16,6 +20,24 @@ class PostForm(forms.ModelForm):
             timezone.now()
         ).strftime('%Y-%m-%dT%H:%M')
 
+    def save(self, commit=True):
+        image_changed = 'image' in self.changed_data
+        previous = self.initial.get('image')
+        previous_meta = self.instance.image_meta
+        if image_changed:
+            self.instance.image_meta = None
+        post = super().save(commit)
+        if commit and image_changed:
+            # Копии строятся после фиксации транзакции в пуле процессов,
+            # ответ на запрос их не ждёт.
+            if post.image:
+                transaction.on_commit(
+                    partial(process_post_image, post.pk, post.image.name))
+            if previous:
+                transaction.on_commit(
+                    partial(release_image, previous.name, previous_meta))
+        return post
+
     class Meta:
         model = Post
         exclude = ('author', )
@@ -0,0 +1,218 @@
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import PurePosixPath
+from threading import Lock
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+
+from core.imaging import render_variants
+from .cache import invalidate_feeds, invalidate_post_card
+from .constants import IMAGE_QUALITY, IMAGE_WIDTHS
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = 'variants'
+
+_executor = None
+_executor_lock = Lock()
+
+
+def get_executor():
+    """
+    Общий пул процессов для обработки изображений.
+
+    ``IMAGE_PROCESSING_WORKERS = 0`` отключает пул: изображения
+    обрабатываются синхронно в вызывающем потоке.
+    """
+    global _executor
+    workers = settings.IMAGE_PROCESSING_WORKERS
+    if not workers:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context('spawn'))
+        return _executor
+
+
+def _reset_executor():
+    global _executor
+    with _executor_lock:
+        _executor = None
+
+
+def image_storage():
+    return Post._meta.get_field('image').storage
+
+
+def variant_name(source, width, ext):
+    path = PurePosixPath(source)
+    return str(path.parent / VARIANTS_DIR / f'{path.stem}_{width}.{ext}')
+
+
+def _save_variant(name, data):
+    # Имя копии однозначно задаётся исходником и шириной, а исходник
+    # хранится по хешу содержимого: копии общие для всех постов с этим
+    # изображением, повторная обработка перезаписывает их на месте.
+    default_storage.delete(name)
+    return default_storage.save(name, ContentFile(data))
+
+
+def delete_variants(meta):
+    for _, items in (meta or {}).get('variants', ()):
+        for _, _, name in items:
+            default_storage.delete(name)
+
+
+def release_image(source, meta=None):
+    """
+    Удаляет файл изображения и его копии, если на него больше не
+    ссылается ни один пост. Возвращает ``True``, если файл удалён.
+
+    Гонку с загрузкой тех же байтов закрывают ``release`` хранилища
+    и ``restore_image`` у загрузившего.
+    """
+    if not source or not image_storage().release(
+            source, Post.objects.filter(image=source).exists):
+        return False
+    if meta and meta.get('source') == source:
+        delete_variants(meta)
+    return True
+
+
+def restore_image(image, upload):
+    """
+    Записывает загруженный файл ``upload`` заново, если его удалил
+    ``release_image`` другого поста, пока пост сохранялся. Вызывается
+    после фиксации транзакции: дальше ссылка на файл видна всем.
+    """
+    if image.storage.exists(image.name):
+        return False
+    upload.seek(0)
+    # Имя задаёт содержимое: те же байты ложатся под тем же именем.
+    image.storage.save(image.field.generate_filename(
+        image.instance, PurePosixPath(upload.name).name), upload)
+    return True
+
+
+def store_variants(post_id, source, rendered):
+    """
+    Сохраняет готовые копии и их размеры в ``Post.image_meta``.
+    Варианты хранятся списком ``[mime, [[w, h, name], ...]]``, запасной
+    формат — последним (порядок ключей JSON в БД не гарантирован).
+
+    Если пока шла обработка изображение поста заменили или пост удалили,
+    результат выбрасывается.
+    """
+    variants = [
+        [mime, [[width, height,
+                 _save_variant(variant_name(source, width, ext), data)]
+                for ext, width, height, data in items]]
+        for mime, items in rendered['variants']
+    ]
+    meta = {'source': source, 'width': rendered['width'],
+            'height': rendered['height'], 'variants': variants}
+
+    if not Post.objects.filter(
+            pk=post_id, image=source).update(image_meta=meta):
+        release_image(source, meta)
+        return None
+    invalidate_post_card(post_id)
+    invalidate_feeds()
+    return meta
+
+
+def _store_result(post_id, source, stored, future):
+    try:
+        stored.set_result(store_variants(post_id, source, future.result()))
+    except Exception as error:
+        logger.exception('Не удалось обработать изображение %s', source)
+        stored.set_exception(error)
+
+
+def _store_pool_result(post_id, source, stored, future):
+    # Колбэк выполняется в служебном потоке пула, вне цикла запроса:
+    # соединения с БД этого потока закрываются здесь же.
+    try:
+        _store_result(post_id, source, stored, future)
+    finally:
+        connections.close_all()
+
+
+def process_post_image(post_id, source):
+    """
+    Ставит изображение поста в обработку.
+
+    Возвращает ``Future``, который завершается после сохранения копий;
+    результат — новое ``image_meta`` или ``None``, если изображение
+    успело смениться. Если у другого поста с тем же файлом копии уже
+    готовы, они переиспользуются без обработки.
+    """
+    stored = Future()
+    shared = (Post.objects.filter(image=source, image_meta__source=source)
+              .exclude(pk=post_id)
+              .values_list('image_meta', flat=True).first())
+    if shared is not None:
+        if Post.objects.filter(pk=post_id, image=source).update(
+                image_meta=shared):
+            invalidate_post_card(post_id)
+            invalidate_feeds()
+        stored.set_result(shared)
+        return stored
+
+    with image_storage().open(source, 'rb') as image:
+        data = image.read()
+    args = (data, IMAGE_WIDTHS, IMAGE_QUALITY)
+
+    executor = get_executor()
+    if executor is not None:
+        try:
+            future = executor.submit(render_variants, *args)
+        except BrokenProcessPool:
+            _reset_executor()
+        else:
+            future.add_done_callback(
+                partial(_store_pool_result, post_id, source, stored))
+            return stored
+
+    future = Future()
+    try:
+        future.set_result(render_variants(*args))
+    except Exception as error:
+        future.set_exception(error)
+    _store_result(post_id, source, stored, future)
+    return stored
+
+
+def picture_context(post, sizes):
+    """
+    Контекст для ``includes/post_picture.html``: ``<source>`` для
+    современных форматов и ``<img>`` со ``srcset``, шириной и высотой.
+    Пока копии не готовы, показывается оригинал.
+    """
+    meta = post.image_meta
+    if not meta or meta.get('source') != post.image.name:
+        return {'src': post.image.url}
+    url = default_storage.url
+
+    def srcset(items):
+        return ', '.join(f'{url(name)} {width}w' for width, _, name in items)
+
+    *modern, (_, fallback) = meta['variants']
+    width, height, largest = fallback[-1]
+    return {
+        'sources': [{'type': mime, 'srcset': srcset(items)}
+                    for mime, items in modern],
+        'src': url(largest),
+        'srcset': srcset(fallback),
+        'sizes': sizes,
+        'width': width,
+        'height': height,
+    }
@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from blog import benchmark
+
+
+class Command(BaseCommand):
+    help = ('Бенчмарк горячих путей блога на синтетических данных: '
+            'пропускная способность и p50/p99 задержки, результат в JSON. '
+            'Запускайте на отдельной базе — команда добавляет данные.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed-data', action='store_true',
+                            help='Сначала наполнить БД данными.')
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--posts', type=int, default=100_000)
+        parser.add_argument('--comments', type=int, default=1_000_000)
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Запросов на каждый сценарий.')
+        parser.add_argument('--scenario', action='append', dest='only',
+                            help='Запустить только указанные сценарии.')
+        parser.add_argument('--anonymous', action='store_true',
+                            help='Измерять ленты от имени гостя.')
+        parser.add_argument('--random-seed', type=int, default=0)
+        parser.add_argument('--output', default='benchmark.json',
+                            help='Файл для результатов в JSON.')
+
+    def handle(self, *args, **options):
+        def log(message):
+            if options['verbosity']:
+                self.stdout.write(message)
+
+        dataset = None
+        if options['seed_data']:
+            dataset = benchmark.seed(
+                options['users'], options['posts'], options['comments'],
+                seed=options['random_seed'], log=log)
+
+        try:
+            results = benchmark.run(
+                options['requests'], only=options['only'],
+                seed=options['random_seed'],
+                anonymous=options['anonymous'], log=log)
+        except (IndexError, RuntimeError) as error:
+            raise CommandError(
+                f'Бенчмарк не выполнен: {error}. '
+                'Нужны данные — запустите с --seed-data.')
+
+        report = {
+            'commit': benchmark.current_commit(),
+            'timestamp': timezone.now().isoformat(),
+            'anonymous': options['anonymous'],
+            'dataset': dataset,
+            'scenarios': results,
+        }
+        Path(options['output']).write_text(
+            json.dumps(report, ensure_ascii=False, indent=2))
+        for name, result in results.items():
+            log(f'{name:>15}: {result["rps"]} rps, '
+                f'p50 {result["p50_ms"]} мс, p99 {result["p99_ms"]} мс')
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты сохранены в {options["output"]}'))
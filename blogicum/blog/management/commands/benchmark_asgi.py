@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from blog import benchmark
+
+
+class Command(BaseCommand):
+    help = ('Сравнение пропускной способности WSGI и ASGI на читающих '
+            'страницах при высокой конкурентности: запросов в секунду '
+            'и задержки. Данные готовит benchmark --seed-data.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000,
+                            help='Число запросов на каждый сервер.')
+        parser.add_argument('--concurrency', type=int, default=64,
+                            help='Одновременных запросов.')
+        parser.add_argument('--workers', type=int,
+                            help='Потоков БД для ASGI; по умолчанию '
+                                 'ASYNC_DB_WORKERS.')
+        parser.add_argument('--random-seed', type=int, default=0)
+        parser.add_argument('--output', default='benchmark_asgi.json',
+                            help='Файл для результатов в JSON.')
+
+    def handle(self, *args, **options):
+        def log(message):
+            if options['verbosity']:
+                self.stdout.write(message)
+
+        try:
+            results = benchmark.run_server_comparison(
+                options['requests'], options['concurrency'],
+                workers=options['workers'], seed=options['random_seed'],
+                log=log)
+        except RuntimeError as error:
+            raise CommandError(
+                f'Бенчмарк не выполнен: {error}. '
+                'Нужны данные — запустите benchmark --seed-data.')
+
+        report = {
+            'commit': benchmark.current_commit(),
+            'timestamp': timezone.now().isoformat(),
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'workers': options['workers'],
+            'servers': results,
+        }
+        Path(options['output']).write_text(
+            json.dumps(report, ensure_ascii=False, indent=2))
+        for server, summary in results.items():
+            log(f'{server:>5}: {summary["ops_per_s"]} запр/с, '
+                f'p50 {summary.get("p50_ms")} мс, '
+                f'p99 {summary.get("p99_ms")} мс, '
+                f'ошибок {summary["errors"]}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты сохранены в {options["output"]}'))
@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from blog import benchmark
+
+PROFILES = ('development', 'production')
+
+
+class Command(BaseCommand):
+    help = ('Конкурентная нагрузка чтение/запись на SQLite для профилей '
+            'БД development и production: операции в секунду, задержки '
+            'и ошибки блокировок. Данные готовит benchmark --seed-data.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', action='append', dest='profiles',
+                            choices=PROFILES,
+                            help='Профиль БД; по умолчанию оба.')
+        parser.add_argument('--duration', type=float, default=10,
+                            help='Длительность прогона, секунды.')
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--random-seed', type=int, default=0)
+        parser.add_argument('--output', default='benchmark_concurrency.json',
+                            help='Файл для результатов в JSON.')
+
+    def handle(self, *args, **options):
+        def log(message):
+            if options['verbosity']:
+                self.stdout.write(message)
+
+        results = {}
+        for profile in options['profiles'] or PROFILES:
+            log(f'Профиль {profile}')
+            benchmark.use_database_profile(profile)
+            try:
+                results[profile] = benchmark.run_concurrent(
+                    options['duration'], options['readers'],
+                    options['writers'], seed=options['random_seed'],
+                    log=log)
+            except RuntimeError as error:
+                raise CommandError(
+                    f'Бенчмарк не выполнен: {error}. '
+                    'Нужны данные — запустите benchmark --seed-data.')
+
+        report = {
+            'commit': benchmark.current_commit(),
+            'timestamp': timezone.now().isoformat(),
+            'readers': options['readers'],
+            'writers': options['writers'],
+            'duration': options['duration'],
+            'profiles': results,
+        }
+        Path(options['output']).write_text(
+            json.dumps(report, ensure_ascii=False, indent=2))
+        for profile, result in results.items():
+            for kind, summary in result.items():
+                log(f'{profile:>12} {kind:>5}: {summary["ops_per_s"]} оп/с, '
+                    f'p99 {summary.get("p99_ms")} мс, '
+                    f'ошибок {summary["errors"]}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты сохранены в {options["output"]}'))
@@ -0,0 +1,53 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from blog.export import (CHUNK_SIZE, InvalidExportParameter, iter_export,
+                         make_cursor, parse_cursor, parse_since)
+
+
+class Command(BaseCommand):
+    help = ('Потоковая выгрузка категорий, локаций, публикаций и '
+            'комментариев в NDJSON с постоянным потреблением памяти. '
+            'Пользователи не выгружаются: fast_loaddata загрузит '
+            'результат в базу, где авторы уже есть.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o', default='-',
+                            help='Файл для записи, по умолчанию stdout.')
+        parser.add_argument('--since',
+                            help='Только записи с created_at не раньше '
+                                 'этой даты (ISO 8601).')
+        parser.add_argument('--changed-since',
+                            help='Только записи, изменённые (updated_at) '
+                                 'не раньше этой даты (ISO 8601).')
+        parser.add_argument('--cursor',
+                            help='Продолжить после записи model:pk.')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            since = parse_since(options['since'])
+            changed_since = parse_since(options['changed_since'])
+            cursor = parse_cursor(options['cursor'])
+        except InvalidExportParameter as error:
+            raise CommandError(error)
+
+        to_stdout = options['output'] == '-'
+        output = (self.stdout if to_stdout
+                  else open(options['output'], 'w', encoding='utf-8'))
+        last, count = options['cursor'], 0
+        try:
+            for model, pk, record in iter_export(
+                    since, cursor, options['chunk_size'], changed_since):
+                # Одна запись за вызов: OutputWrapper не добавит
+                # второй перевод строки.
+                output.write(json.dumps(record, cls=DjangoJSONEncoder,
+                                        ensure_ascii=False) + '\n')
+                last, count = make_cursor(model, pk), count + 1
+        finally:
+            if not to_stdout:
+                output.close()
+            # Курсор — в stderr, чтобы не смешиваться с данными в stdout.
+            self.stderr.write(f'Выгружено {count} записей, курсор: {last}')
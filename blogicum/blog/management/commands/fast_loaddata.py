@@ -0,0 +1,217 @@
+import bz2
+import gzip
+import lzma
+from collections import defaultdict
+from pathlib import Path
+from time import perf_counter
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.serializers import base, python
+from django.db import (DEFAULT_DB_ALIAS, DatabaseError, connections, router,
+                       transaction)
+
+from blog.cache import invalidate_feeds, invalidate_post_cards
+from blog.models import Comment, Post
+from blog.publication import reset_horizon
+from blog.search import get_backend
+from core.streaming import iter_json_array, iter_json_lines
+
+OPENERS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+LINE_FORMATS = ('.ndjson', '.jsonl')
+
+
+class Command(BaseCommand):
+    help = ('Быстрая загрузка больших JSON/NDJSON-фикстур: потоковое '
+            'чтение, вставка пачками без сигналов, проверка внешних '
+            'ключей в конце. Как и loaddata, строки с уже существующим '
+            'первичным ключом (например, права и типы содержимого, '
+            'созданные migrate) обновляются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixtures', nargs='+',
+                            help='Пути к .json/.ndjson (+ .gz/.bz2/.xz).')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--ignorenonexistent', '-i', action='store_true',
+                            help='Пропускать поля, которых нет в моделях.')
+
+    def handle(self, *args, **options):
+        self.using = options['database']
+        self.batch_size = options['batch_size']
+        self.verbosity = options['verbosity']
+        self.pending = defaultdict(list)
+        self.pending_m2m = defaultdict(list)
+        self.m2m_sources = {}
+        self.m2m_owners = defaultdict(set)
+        self.updated = defaultdict(set)
+        self.models = set()
+        self.loaded = 0
+        self.started = perf_counter()
+
+        connection = connections[self.using]
+        with transaction.atomic(using=self.using):
+            with connection.constraint_checks_disabled():
+                for fixture in options['fixtures']:
+                    self.load(Path(fixture), options['ignorenonexistent'])
+                self.flush_all()
+            table_names = [model._meta.db_table for model in self.models]
+            try:
+                connection.check_constraints(table_names=table_names)
+            except Exception as error:
+                raise CommandError(
+                    f'Нарушена ссылочная целостность: {error}')
+            self.reset_sequences(connection)
+
+        if Comment in self.models:
+            call_command('recount_comments', database=self.using,
+                         verbosity=0)
+        if Post in self.models:
+            get_backend().rebuild(using=self.using)
+        invalidate_post_cards()
+        invalidate_feeds()
+        reset_horizon()
+
+        elapsed = perf_counter() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено {self.loaded} объектов за {elapsed:.1f} с '
+            f'({self.loaded / elapsed if elapsed else 0:.0f} строк/с)'))
+
+    def open(self, path):
+        suffix = path.suffix
+        opener = OPENERS.get(suffix, open)
+        stem = path.with_suffix('') if suffix in OPENERS else path
+        return opener(path, 'rt', encoding='utf-8'), stem.suffix
+
+    def load(self, path, ignorenonexistent):
+        if not path.exists():
+            raise CommandError(f'Файл фикстуры не найден: {path}')
+        stream, data_format = self.open(path)
+        with stream:
+            raw = (iter_json_lines(stream) if data_format in LINE_FORMATS
+                   else iter_json_array(stream))
+            objects = python.Deserializer(
+                raw, using=self.using, ignorenonexistent=ignorenonexistent)
+            try:
+                for deserialized in objects:
+                    self.add(deserialized)
+            except (base.DeserializationError, ValueError) as error:
+                raise CommandError(f'Ошибка в фикстуре {path}: {error}')
+
+    def add(self, deserialized):
+        obj = deserialized.object
+        model = type(obj)
+        if not router.allow_migrate_model(self.using, model):
+            return
+        self.models.add(model)
+        batch = self.pending[model]
+        batch.append(obj)
+        for name, values in (deserialized.m2m_data or {}).items():
+            field = model._meta.get_field(name)
+            through = field.remote_field.through
+            source = field.m2m_field_name()
+            target = field.m2m_reverse_field_name()
+            self.models.add(through)
+            self.m2m_sources[through] = (model, source)
+            self.m2m_owners[through].add(obj.pk)
+            self.pending_m2m[through].extend(
+                through(**{f'{source}_id': obj.pk, f'{target}_id': value})
+                for value in values)
+        if len(batch) >= self.batch_size:
+            self.flush(model)
+
+    def existing_pks(self, model, objs):
+        pks = [obj.pk for obj in objs if obj.pk is not None]
+        if not pks:
+            return set()
+        manager = model._base_manager.using(self.using)
+        size = connections[self.using].features.max_query_params or len(pks)
+        existing = set()
+        for start in range(0, len(pks), size):
+            existing.update(manager.filter(
+                pk__in=pks[start:start + size]).values_list('pk', flat=True))
+        return existing
+
+    def save(self, model, objs):
+        """
+        Строки с уже существующим ``pk`` обновляются по одной, как
+        в ``loaddata``; остальные вставляются пачками.
+        """
+        existing = self.existing_pks(model, objs)
+        if existing:
+            fields = [field for field in model._meta.concrete_fields
+                      if not field.primary_key]
+            manager = model._base_manager.using(self.using)
+            for obj in objs:
+                if obj.pk in existing:
+                    # _update, а не update(): значения из фикстуры
+                    # пишутся как есть, включая updated_at.
+                    manager.filter(pk=obj.pk)._update([
+                        (field, None, getattr(obj, field.attname))
+                        for field in fields])
+            self.updated[model].update(existing)
+            self.loaded += len(existing)
+            objs = [obj for obj in objs if obj.pk not in existing]
+        self.insert(model, objs)
+
+    def insert(self, model, objs):
+        with_pk = [obj for obj in objs if obj.pk is not None]
+        if len(with_pk) != len(objs):
+            self.insert(model, with_pk)
+            objs = [obj for obj in objs if obj.pk is None]
+        if not objs:
+            return
+        fields = [field for field in model._meta.concrete_fields
+                  if objs[0].pk is not None or not field.primary_key]
+        ops = connections[self.using].ops
+        size = max(1, ops.bulk_batch_size(fields, objs))
+        for start in range(0, len(objs), size):
+            # raw=True: значения пишутся как есть, без pre_save —
+            # auto_now_add не перетирает даты из фикстуры.
+            try:
+                model._base_manager.using(self.using)._insert(
+                    objs[start:start + size], fields=fields, raw=True,
+                    using=self.using)
+            except DatabaseError as error:
+                raise CommandError(
+                    f'Не удалось загрузить {model._meta.label}: {error}')
+        self.loaded += len(objs)
+        if self.verbosity > 1:
+            elapsed = perf_counter() - self.started
+            self.stdout.write(
+                f'{model._meta.label}: всего {self.loaded} '
+                f'({self.loaded / elapsed:.0f} строк/с)')
+
+    def flush(self, model):
+        objs = self.pending.pop(model, [])
+        if objs:
+            self.save(model, objs)
+
+    def flush_all(self):
+        for model in list(self.pending):
+            self.flush(model)
+        for through, objs in self.pending_m2m.items():
+            # Связи обновлённых объектов заменяются целиком, как при
+            # присваивании m2m в loaddata.
+            model, source = self.m2m_sources[through]
+            replaced = self.updated[model] & self.m2m_owners[through]
+            if replaced:
+                through._base_manager.using(self.using).filter(**{
+                    f'{source}_id__in': replaced})._raw_delete(self.using)
+            for start in range(0, len(objs), self.batch_size):
+                self.insert(through, objs[start:start + self.batch_size])
+        self.pending_m2m.clear()
+        self.m2m_owners.clear()
+
+    def reset_sequences(self, connection):
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), list(self.models))
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
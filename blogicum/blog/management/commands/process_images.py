@@ -0,0 +1,30 @@
+from concurrent.futures import wait
+
+from django.core.management.base import BaseCommand
+
+from blog.images import process_post_image
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = ('Строит уменьшенные копии и WebP/AVIF-варианты изображений '
+            'постов, у которых их ещё нет (например, после загрузки '
+            'через админку или fast_loaddata).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help='Перестроить копии для всех изображений.')
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='').order_by('pk')
+        futures = []
+        for pk, image, meta in posts.values_list(
+                'pk', 'image', 'image_meta').iterator():
+            if (options['all'] or not meta
+                    or meta.get('source') != image):
+                futures.append(process_post_image(pk, image))
+        wait(futures)
+        failed = sum(future.exception() is not None for future in futures)
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано изображений: {len(futures) - failed}, '
+            f'ошибок: {failed}'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from blog.search import get_backend
+
+
+class Command(BaseCommand):
+    help = ('Перестраивает поисковый индекс публикаций: нужен после '
+            'массовых изменений в обход сигналов (bulk_create, update).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        get_backend().rebuild(using=options['database'])
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен'))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, F
+
+from blog.models import Post
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает Post.comment_count по таблице комментариев '
+            'и исправляет расхождения.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать посты с расхождением, ничего не менять.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options['database']
+        drifted = (Post.objects.using(using)
+                   .annotate(actual=Count('comments'))
+                   .exclude(comment_count=F('actual'))
+                   .values_list('pk', 'comment_count', 'actual'))
+        fixed = []
+        for pk, stored, actual in drifted.iterator():
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Пост {pk}: {stored} -> {actual}')
+            fixed.append(Post(pk=pk, comment_count=actual))
+
+        if fixed and not options['dry_run']:
+            with transaction.atomic(using=using):
+                Post.objects.using(using).bulk_update(
+                    fixed, ['comment_count'], batch_size=BATCH_SIZE)
+
+        action = 'Найдено' if options['dry_run'] else 'Исправлено'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} расхождений: {len(fixed)}'))
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:43
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_image_meta'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank='True', storage=core.storage.ContentAddressedStorage(), upload_to='post_imagine', verbose_name='Изображение'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:59
+
+import core.fields
+from django.db import migrations, models
+
+
+def fill_updated_at(apps, schema_editor):
+    # Существующие записи не менялись с момента создания.
+    for name in ('Category', 'Comment', 'Location', 'Post'):
+        apps.get_model('blog', name).objects.update(
+            updated_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='updated_at',
+            field=core.fields.ModificationDateTimeField(verbose_name='Изменено'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='updated_at',
+            field=core.fields.ModificationDateTimeField(verbose_name='Изменено'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='updated_at',
+            field=core.fields.ModificationDateTimeField(verbose_name='Изменено'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=core.fields.ModificationDateTimeField(verbose_name='Изменено'),
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:03
+
+import core.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='updated_at',
+            field=core.fields.ModificationDateTimeField(db_index=True, verbose_name='Изменено'),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='updated_at',
+            field=core.fields.ModificationDateTimeField(db_index=True, verbose_name='Изменено'),
+        ),
+        migrations.AlterField(
+            model_name='location',
+            name='updated_at',
+            field=core.fields.ModificationDateTimeField(db_index=True, verbose_name='Изменено'),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='updated_at',
+            field=core.fields.ModificationDateTimeField(db_index=True, verbose_name='Изменено'),
+        ),
+    ]
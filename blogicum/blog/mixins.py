@@ -2,6 +2,7 @@ from django.contrib.auth.mixins import UserPassesTestMixin
 from django.shortcuts import redirect
 from django.urls import reverse
 
+from core.paginator import paginate
 from .models import Comment, Post
 
 
@@ -36,3 +37,16 @@ class CommentMixin:
         return reverse(
             'blog:post_detail', kwargs={
                 'post_id': self.get_object().post_id})
+
+
+# Feeds: IndexList, Profile
+class FeedPaginationMixin:
+
+    def get_feed_count(self):
+        """Число записей ленты, если оно известно без ``COUNT(*)``."""
+        return None
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page = paginate(
+            self.request, queryset, page_size, self.get_feed_count())
+        return (paginator, page, page.object_list, page.has_other_pages())
@@ -3,6 +3,7 @@ from django.db import models
 from django.urls import reverse
 
 from core.models import TotalPublishCreate
+from core.storage import ContentAddressedStorage
 from core.utils import PostsQuerySet
 from . import constants
 
@@ -83,7 +84,15 @@ class Post(TotalPublishCreate):
     )
     image = models.ImageField(
         'Изображение', blank='True',
-        upload_to='post_imagine')
+        upload_to='post_imagine', storage=ContentAddressedStorage())
+    image_meta = models.JSONField(
+        null=True, blank=True, editable=False,
+        verbose_name='Размеры и уменьшенные копии изображения'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0, editable=False,
+        verbose_name='Количество комментариев'
+    )
 
     objects = PostsQuerySet.as_manager()
 
@@ -91,6 +100,15 @@ class Post(TotalPublishCreate):
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date', )
+        indexes = (
+            models.Index(fields=('-pub_date', '-id'),
+                         condition=models.Q(is_published=True),
+                         name='post_feed_idx'),
+            models.Index(fields=('author', '-pub_date', '-id'),
+                         name='post_author_feed_idx'),
+            models.Index(fields=('category', '-pub_date', '-id'),
+                         name='post_category_feed_idx'),
+        )
 
     def __str__(self):
         return self.title[:constants.DISPLAY_LENGTH]
@@ -119,6 +137,10 @@ class Comment(TotalPublishCreate):
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at', )
         default_related_name = 'comments'
+        indexes = (
+            models.Index(fields=('post', 'created_at', 'id'),
+                         name='comment_post_created_idx'),
+        )
 
     def __str__(self):
         return self.text[:constants.DISPLAY_LENGTH]
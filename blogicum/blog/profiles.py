@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+
+from core.cache import bump_version, get_versions
+from .models import Post
+
+User = get_user_model()
+
+PROFILES = 'profiles'
+# Поля шапки профиля: всё, что страница показывает о пользователе.
+PROFILE_FIELDS = ('id', 'username', 'first_name', 'last_name',
+                  'date_joined', 'is_staff')
+# Изменяемые поля пользователя, которые видны на страницах сайта.
+DISPLAYED_FIELDS = ('username', 'first_name', 'last_name', 'is_staff')
+
+
+def author_version_name(author_id):
+    return f'author:{author_id}'
+
+
+def _profile_key(username):
+    generation, = get_versions(PROFILES)
+    return f'{PROFILES}:{generation}:user:{username}'
+
+
+def get_profile(username):
+    """
+    Публичная шапка профиля из кэша: пользователь только с полями
+    ``PROFILE_FIELDS``. Ключ строится по имени, поэтому при изменении
+    пользователя шапка удаляется по старому и новому имени
+    (``forget_profile``).
+    """
+    key = _profile_key(username)
+    profile = cache.get(key)
+    if profile is None:
+        profile = get_object_or_404(
+            User.objects.only(*PROFILE_FIELDS), username=username)
+        cache.set(key, profile, settings.PROFILE_CACHE_TIMEOUT)
+    return profile
+
+
+def author_posts(author, own):
+    """Лента автора: все его посты для него самого, иначе опубликованные."""
+    posts = Post.objects.posts_annotate().filter(author=author)
+    return posts if own else posts.posts_published()
+
+
+def author_post_count(author, own):
+    """
+    Число постов в ленте автора из кэша.
+
+    Счётчик зависит от версии автора (его посты сохранены или удалены)
+    и от поколения профилей (категории, отложенные публикации).
+    """
+    generation, version = get_versions(
+        PROFILES, author_version_name(author.pk))
+    scope = 'all' if own else 'published'
+    key = f'{PROFILES}:{generation}:count:{author.pk}:{version}:{scope}'
+    count = cache.get(key)
+    if count is None:
+        count = author_posts(author, own).order_by().count()
+        cache.set(key, count, settings.PROFILE_CACHE_TIMEOUT)
+    return count
+
+
+def profile_feed(viewer, username):
+    """
+    Возвращает ``(profile, posts, count)`` для страницы профиля.
+
+    Пользователь и счётчик берутся из кэша, поэтому при тёплом кэше
+    остаётся один запрос — сама страница постов.
+    """
+    profile = get_profile(username)
+    own = viewer.is_authenticated and viewer.pk == profile.pk
+    return profile, author_posts(profile, own), author_post_count(profile, own)
+
+
+def invalidate_author(author_id):
+    bump_version(author_version_name(author_id))
+
+
+def forget_profile(username):
+    cache.delete(_profile_key(username))
+
+
+def invalidate_profiles():
+    bump_version(PROFILES)
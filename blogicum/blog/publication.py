@@ -0,0 +1,68 @@
+import math
+
+from django.core.cache import cache
+from django.db.models import Min
+from django.dispatch import Signal
+from django.utils import timezone
+
+HORIZON_KEY = 'publication_horizon'
+
+# Отправляется, когда наступило время отложенных публикаций:
+# sender — модель Post, horizon — наступивший момент публикации.
+deferred_posts_published = Signal()
+
+
+def _compute_horizon(now):
+    from .models import Post
+
+    return (Post.objects
+            .filter(pub_date__gt=now, is_published=True)
+            .aggregate(horizon=Min('pub_date'))['horizon'])
+
+
+def get_horizon():
+    """
+    «Горизонт публикаций» — ближайший pub_date в будущем или None.
+
+    До этого момента набор видимых постов меняется только при записи
+    в БД, поэтому ленты можно кэшировать до горизонта без проверки
+    ``pub_date <= now()`` на каждом запросе.
+    """
+    stored = cache.get(HORIZON_KEY)
+    if stored is None:
+        stored = (_compute_horizon(timezone.now()), )
+        cache.set(HORIZON_KEY, stored, None)
+    return stored[0]
+
+
+def reset_horizon():
+    cache.delete(HORIZON_KEY)
+
+
+def refresh_horizon():
+    """
+    Проверяет, не наступил ли горизонт. Если наступил — отправляет
+    ``deferred_posts_published`` и сдвигает горизонт.
+
+    Отметка ``cache.add`` делает отправку однократной только в пределах
+    кэша: с общим кэшем (CACHES в профиле production) сигнал получает
+    один процесс, а с LocMemCache — каждый процесс, у которого к тому же
+    свой горизонт. Получатели должны быть идемпотентны.
+    """
+    horizon = get_horizon()
+    now = timezone.now()
+    if horizon is None or horizon > now:
+        return horizon
+    if cache.add(f'{HORIZON_KEY}:passed:{horizon.timestamp()}', True):
+        cache.set(HORIZON_KEY, (_compute_horizon(now), ), None)
+        from .models import Post
+        deferred_posts_published.send(sender=Post, horizon=horizon)
+    return get_horizon()
+
+
+def seconds_until_horizon(default):
+    horizon = refresh_horizon()
+    if horizon is None:
+        return default
+    seconds = (horizon - timezone.now()).total_seconds()
+    return max(0, min(default, math.ceil(seconds)))
@@ -0,0 +1,155 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from core.db import JoinedColumn, join_derived
+from .models import Post
+
+FTS_TABLE = 'blog_post_fts'
+# Вес совпадения в заголовке относительно совпадения в тексте.
+TITLE_WEIGHT = 10.0
+MAX_QUERY_LENGTH = 200
+MAX_TERMS = 10
+TERM = re.compile(r'\w+')
+
+
+def query_terms(query):
+    return TERM.findall(query[:MAX_QUERY_LENGTH])[:MAX_TERMS]
+
+
+class BaseSearchBackend:
+    """
+    Интерфейс поискового бэкенда публикаций.
+
+    ``filter`` отбирает из переданного queryset совпадения (правила
+    видимости остаются за вызывающим), ``search`` вдобавок добавляет
+    аннотацию ``search_rank``;
+    ``ordering`` — уникальный порядок выдачи. Ранг зависит от всего
+    индекса и меняется при любой правке постов, поэтому курсоры по
+    нему ненадёжны: выдача листается по номеру страницы (OFFSET), и
+    после изменения индекса границы страниц могут сдвинуться.
+    ``index``/``remove`` вызываются сигналами при изменении постов,
+    ``rebuild`` — после массовых загрузок в обход сигналов.
+    """
+
+    ordering = ('search_rank', '-id')
+
+    def filter(self, queryset, query):
+        raise NotImplementedError
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+    def empty(self, queryset):
+        return queryset.annotate(search_rank=Value(0.0)).none()
+
+    def index(self, post):
+        pass
+
+    def remove(self, post_id):
+        pass
+
+    def rebuild(self, using=DEFAULT_DB_ALIAS):
+        pass
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """
+    Поиск подстрок через ``icontains`` без отдельного индекса.
+
+    Работает на любой СУБД, но сканирует таблицу постов; выдача
+    упорядочена по дате, как лента.
+    """
+
+    ordering = ('-pub_date', '-id')
+
+    def filter(self, queryset, query):
+        terms = query_terms(query)
+        if not terms:
+            return queryset.none()
+        condition = Q()
+        for term in terms:
+            condition &= Q(title__icontains=term) | Q(text__icontains=term)
+        return queryset.filter(condition)
+
+    def search(self, queryset, query):
+        return self.filter(queryset, query).annotate(
+            search_rank=Value(0.0))
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """
+    Полнотекстовый поиск SQLite FTS5 по заголовку и тексту.
+
+    Таблица ``blog_post_fts`` (rowid = id поста) создаётся миграцией
+    и обновляется сигналами. Каждое слово запроса ищется как префикс,
+    релевантность — ``bm25`` с повышенным весом заголовка (меньше —
+    лучше, поэтому сортировка по возрастанию). MATCH выполняется один
+    раз: ранги приходят присоединённой производной таблицей, а не
+    подзапросом на каждую строку.
+    """
+
+    def match_expression(self, query):
+        return ' '.join(f'"{term}"*' for term in query_terms(query))
+
+    def filter(self, queryset, query):
+        expression = self.match_expression(query)
+        if not expression:
+            return queryset.none()
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (expression, )))
+
+    def search(self, queryset, query):
+        expression = self.match_expression(query)
+        if not expression:
+            return self.empty(queryset)
+        queryset, alias = join_derived(
+            queryset,
+            f'SELECT rowid, bm25({FTS_TABLE}, %s, 1.0) AS rank '
+            f'FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (TITLE_WEIGHT, expression), alias='fts_rank', column='rowid')
+        return queryset.annotate(
+            search_rank=JoinedColumn(alias, 'rank', FloatField()))
+
+    def index(self, post):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', (post.pk, ))
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+                'VALUES (%s, %s, %s)', (post.pk, post.title, post.text))
+
+    def remove(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', (post_id, ))
+
+    def rebuild(self, using=DEFAULT_DB_ALIAS):
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+                f'SELECT id, title, text FROM {Post._meta.db_table}')
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    return import_string(settings.SEARCH_BACKEND)()
+
+
+def filter_posts(queryset, query):
+    return get_backend().filter(queryset, query)
+
+
+@receiver(setting_changed)
+def reset_backend(setting, **kwargs):
+    if setting == 'SEARCH_BACKEND':
+        get_backend.cache_clear()
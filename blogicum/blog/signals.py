@@ -0,0 +1,168 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import (invalidate_feeds, invalidate_post_card,
+                    invalidate_post_cards)
+from .images import release_image, restore_image
+from .models import Category, Comment, Location, Post
+from .profiles import (DISPLAYED_FIELDS, forget_profile, invalidate_author,
+                       invalidate_profiles)
+from .publication import deferred_posts_published, reset_horizon
+from .search import get_backend
+
+User = get_user_model()
+
+
+def after_commit(*callbacks):
+    # Версии кэша сбрасываются после фиксации: иначе параллельный
+    # читатель успел бы закэшировать старые данные под новой версией.
+    # Внутри транзакции они сбрасываются и сразу, чтобы её собственные
+    # чтения видели сделанные изменения.
+    in_transaction = transaction.get_connection().in_atomic_block
+    for callback in callbacks:
+        if in_transaction:
+            callback()
+        transaction.on_commit(callback)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1)
+        after_commit(partial(invalidate_post_card, instance.post_id),
+                     invalidate_feeds)
+
+
+@receiver(post_save, sender=Comment)
+def invalidate_edited_comment(sender, instance, created, **kwargs):
+    # Текст комментария виден на странице поста: её ETag строится
+    # из версии поста.
+    if not created:
+        after_commit(partial(invalidate_post_card, instance.post_id))
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1)
+    after_commit(partial(invalidate_post_card, instance.post_id),
+                 invalidate_feeds)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    # Пост, переданный другому автору, меняет счётчики обоих профилей.
+    authors = {instance.author_id,
+               instance.__dict__.pop('_author_before', None)} - {None}
+    after_commit(partial(invalidate_post_card, instance.pk),
+                 *(partial(invalidate_author, author_id)
+                   for author_id in authors),
+                 invalidate_feeds, reset_horizon)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_author(sender, instance, raw, update_fields=None,
+                         **kwargs):
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not (
+            {'author', 'author_id'} & set(update_fields)):
+        return
+    instance._author_before = (
+        Post.objects.filter(pk=instance.pk)
+        .values_list('author_id', flat=True).first())
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, raw, **kwargs):
+    if not raw:
+        get_backend().index(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    get_backend().remove(instance.pk)
+
+
+@receiver(pre_save, sender=Post)
+def remember_uploaded_image(sender, instance, raw, **kwargs):
+    # Незафиксированный файл пришёл с этим сохранением; после save()
+    # поле указывает уже на имя в хранилище.
+    image = instance.image
+    if not raw and image and not image._committed:
+        instance._uploaded_image = image.file
+
+
+@receiver(post_save, sender=Post)
+def keep_post_image(sender, instance, **kwargs):
+    upload = instance.__dict__.pop('_uploaded_image', None)
+    if upload is not None:
+        transaction.on_commit(
+            partial(restore_image, instance.image, upload))
+
+
+@receiver(post_delete, sender=Post)
+def release_post_image(sender, instance, **kwargs):
+    # Файлы удаляются только после фиксации: при откате удаления
+    # пост не останется без изображения.
+    if instance.image:
+        transaction.on_commit(partial(
+            release_image, instance.image.name, instance.image_meta))
+
+
+@receiver(deferred_posts_published)
+def publish_deferred_posts(sender, **kwargs):
+    invalidate_profiles()
+    invalidate_feeds()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_cards(sender, **kwargs):
+    after_commit(invalidate_post_cards, invalidate_feeds)
+    if sender is Category:
+        # Скрытая категория убирает посты из счётчиков профилей.
+        after_commit(invalidate_profiles)
+
+
+@receiver(pre_save, sender=User)
+def remember_displayed_fields(sender, instance, raw, update_fields=None,
+                              **kwargs):
+    instance._displayed_before = None
+    if raw or instance._state.adding:
+        return
+    # Вход в систему сохраняет только last_login — читать нечего.
+    if update_fields is not None and not (
+            set(update_fields) & set(DISPLAYED_FIELDS)):
+        return
+    instance._displayed_before = (
+        User.objects.filter(pk=instance.pk)
+        .values(*DISPLAYED_FIELDS).first())
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_cards(sender, instance, created, **kwargs):
+    # Регистрация, вход и смена пароля не меняют ничего на страницах:
+    # сбрасываются только профиль и карточки автора, чьё имя изменилось.
+    before = getattr(instance, '_displayed_before', None)
+    if created or before is None:
+        return
+    if all(before[name] == getattr(instance, name)
+           for name in DISPLAYED_FIELDS):
+        return
+    after_commit(partial(forget_profile, before['username']),
+                 partial(forget_profile, instance.username))
+    after_commit(*(partial(invalidate_post_card, post_id)
+                   for post_id in (Post.objects.filter(author=instance)
+                                   .values_list('pk', flat=True))))
+    # Имя автора есть в закэшированных страницах лент и профиля.
+    after_commit(invalidate_feeds)
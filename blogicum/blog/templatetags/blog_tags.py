@@ -0,0 +1,16 @@
+from django import template
+
+from blog.cache import render_post_card
+from blog.images import picture_context
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card(post):
+    return render_post_card(post)
+
+
+@register.inclusion_tag('includes/post_picture.html')
+def post_picture(post, sizes='(max-width: 40rem) 100vw, 40rem', lazy=False):
+    return {'post': post, 'lazy': lazy, **picture_context(post, sizes)}
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 app_name = 'blog'
 
@@ -13,6 +13,10 @@ urlpatterns = [
         'posts/<int:post_id>/',
         views.post_detail,
         name='post_detail'),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.post_comments,
+        name='post_comments'),
     path(
         'posts/create/',
         views.PostCreateView.as_view(),
@@ -49,4 +53,40 @@ urlpatterns = [
         'category/<slug:category_slug>/',
         views.category_posts,
         name='category_posts'),
+    path(
+        'stats/cache/',
+        views.cache_stats,
+        name='cache_stats'),
+    path(
+        'search/',
+        views.search,
+        name='search'),
+    path(
+        'export/',
+        views.export_ndjson,
+        name='export'),
+    path(
+        'feeds/rss/',
+        feeds.feed_view(feeds.PostFeed),
+        name='feed'),
+    path(
+        'feeds/atom/',
+        feeds.feed_view(feeds.AtomPostFeed),
+        name='feed_atom'),
+    path(
+        'category/<slug:category_slug>/rss/',
+        feeds.feed_view(feeds.CategoryPostFeed),
+        name='category_feed'),
+    path(
+        'category/<slug:category_slug>/atom/',
+        feeds.feed_view(feeds.AtomCategoryPostFeed),
+        name='category_feed_atom'),
+    path(
+        'profile/<str:username>/rss/',
+        feeds.feed_view(feeds.AuthorPostFeed),
+        name='profile_feed'),
+    path(
+        'profile/<str:username>/atom/',
+        feeds.feed_view(feeds.AtomAuthorPostFeed),
+        name='profile_feed_atom'),
 ]
@@ -1,46 +1,57 @@
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.paginator import Paginator
-from django.http import Http404
-from django.shortcuts import get_object_or_404, render
+from django.db import transaction
+from django.http import (Http404, HttpResponseBadRequest, JsonResponse,
+                         StreamingHttpResponse)
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
 from django.urls import reverse, reverse_lazy
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.http import urlencode
 from django.views.generic import (CreateView, DeleteView, ListView,
                                   UpdateView)
 
-from .constants import AMOUNT_POSTS
+from core.paginator import KeysetPaginator, paginate
+from core.routers import replica_reads
+from .cache import cache_feed, page_cache_stats, post_card_stats
+from .conditional import conditional_feed, conditional_post
+from .constants import AMOUNT_COMMENTS, AMOUNT_POSTS
+from .export import (InvalidExportParameter, iter_ndjson, parse_cursor,
+                     parse_since)
 from .forms import CommentForm, PostForm, UserEditForm
-from .mixins import AuthorMixin, CommentMixin, PostMixin
+from .mixins import (AuthorMixin, CommentMixin, FeedPaginationMixin,
+                     PostMixin)
 from .models import Category, Comment, Post
+from .profiles import profile_feed
+from .search import get_backend
 
 User = get_user_model()
 
 
-class ProfileDetailView(ListView):
+@method_decorator(conditional_feed, name='dispatch')
+@method_decorator(cache_feed, name='dispatch')
+class ProfileDetailView(FeedPaginationMixin, ListView):
     model = Post
     template_name = 'blog/profile.html'
     paginate_by = AMOUNT_POSTS
+    replica_reads = True
     slug_field = 'username'
     slug_url_kwarg = 'username'
 
     def get_queryset(self):
-        self.profile = get_object_or_404(
-            User, username=self.kwargs['username'])
+        self.profile, posts, self.post_count = profile_feed(
+            self.request.user, self.kwargs['username'])
+        return posts
 
-        if self.request.user == self.profile:
-            return (Post.objects.posts_annotate()
-                    .filter(author=self.profile))
-
-        return (Post.objects
-                .posts_published()
-                .posts_annotate()
-                .filter(author=self.profile))
+    def get_feed_count(self):
+        return self.post_count
 
     def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['profile'] = self.profile
-        context['user'] = self.request.user
-        return context
+        return super().get_context_data(
+            profile=self.profile, post_count=self.post_count, **kwargs)
 
 
 class ProfileUpdateView(LoginRequiredMixin, UpdateView):
@@ -74,10 +85,13 @@ class PostUpdateView(AuthorMixin, PostMixin, UpdateView):
     form_class = PostForm
 
 
-class IndexPostListView(ListView):
+@method_decorator(conditional_feed, name='dispatch')
+@method_decorator(cache_feed, name='dispatch')
+class IndexPostListView(FeedPaginationMixin, ListView):
     model = Post
     template_name = 'blog/index.html'
     paginate_by = AMOUNT_POSTS
+    replica_reads = True
 
     def get_queryset(self):
         return (Post.objects
@@ -96,28 +110,58 @@ class PostDeleteView(AuthorMixin, PostMixin, DeleteView):
         return context
 
 
+def get_post_for_reader(request, post_id):
+    post = get_object_or_404(
+        Post.objects.select_related('category', 'author', 'location'),
+        pk=post_id)
+    if post.category is None:
+        raise Http404
+
+    if (request.user == post.author
+        or (post.is_published and post.category.is_published
+            and post.pub_date <= timezone.now())):
+        return post
+
+    raise Http404
+
+
+def get_comments_page(request, post):
+    paginator = KeysetPaginator(
+        post.comments.select_related('author'), AMOUNT_COMMENTS,
+        ordering=('created_at', 'id'))
+    return paginator.get_page(request.GET.get('cursor'))
+
+
+@replica_reads
+@conditional_post
 def post_detail(request, post_id):
     template_path = 'blog/detail.html'
-    post = get_object_or_404(Post, pk=post_id)
-    category = get_object_or_404(Category, pk=post.category_id)
+    post = get_post_for_reader(request, post_id)
     context = {
         'post': post,
         'form': CommentForm(),
-        'comments': post.comments.all()
+        'comments': get_comments_page(request, post)
     }
+    return TemplateResponse(request, template_path, context)
 
-    if (request.user == post.author
-        or (post.is_published and category.is_published
-            and post.pub_date <= timezone.now())):
-        return render(request, template_path, context)
 
-    raise Http404
+@replica_reads
+@conditional_post
+def post_comments(request, post_id):
+    template_path = 'includes/comment_list.html'
+    post = get_post_for_reader(request, post_id)
+    context = {
+        'post': post,
+        'comments': get_comments_page(request, post)
+    }
+    return TemplateResponse(request, template_path, context)
 
 
 class CommentCreateView(LoginRequiredMixin, CreateView):
     model = Comment
     form_class = CommentForm
 
+    @transaction.atomic
     def form_valid(self, form):
         form.instance.author = self.request.user
         form.instance.post_id = (get_object_or_404(
@@ -135,9 +179,15 @@ class CommentUpdateView(AuthorMixin, CommentMixin, UpdateView):
 
 
 class CommentDelete(AuthorMixin, CommentMixin, DeleteView):
-    pass
+
+    @transaction.atomic
+    def delete(self, request, *args, **kwargs):
+        return super().delete(request, *args, **kwargs)
 
 
+@replica_reads
+@conditional_feed
+@cache_feed
 def category_posts(request, category_slug):
     template_path = 'blog/category.html'
     category = get_object_or_404(
@@ -150,12 +200,48 @@ def category_posts(request, category_slug):
         .posts_annotate()
         .filter(category=category)
     )
-    paginator = Paginator(posts_list, AMOUNT_POSTS)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    _, page_obj = paginate(request, posts_list, AMOUNT_POSTS)
 
     context = {
         'category': category,
         'page_obj': page_obj
     }
-    return render(request, template_path, context)
+    return TemplateResponse(request, template_path, context)
+
+
+@staff_member_required
+def cache_stats(request):
+    return JsonResponse({
+        'post_cards': post_card_stats(),
+        'pages': page_cache_stats(),
+    })
+
+
+@staff_member_required
+def export_ndjson(request):
+    try:
+        since = parse_since(request.GET.get('since'))
+        changed_since = parse_since(request.GET.get('changed_since'))
+        cursor = parse_cursor(request.GET.get('cursor'))
+    except InvalidExportParameter as error:
+        return HttpResponseBadRequest(str(error))
+    return StreamingHttpResponse(
+        iter_ndjson(since, cursor, changed_since=changed_since),
+        content_type='application/x-ndjson')
+
+
+@replica_reads
+def search(request):
+    query = request.GET.get('q', '').strip()
+    backend = get_backend()
+    posts = backend.search(
+        Post.objects.posts_published().posts_annotate(), query)
+    # Ранг меняется вместе с индексом, поэтому курсор по нему
+    # пропускал бы или повторял записи: выдача листается по номеру.
+    paginator = Paginator(posts.order_by(*backend.ordering), AMOUNT_POSTS)
+    page = paginator.get_page(request.GET.get('page'))
+    return TemplateResponse(request, 'blog/search.html', {
+        'query': query,
+        'page_obj': page,
+        'page_query': urlencode({'q': query}),
+    })
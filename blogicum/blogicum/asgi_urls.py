@@ -0,0 +1,16 @@
+"""
+Маршруты для ASGI: как в ``blogicum.urls``, но читающие страницы
+блога обслуживают асинхронные представления (``blog.async_urls``).
+"""
+from django.urls import include, path
+
+from . import urls
+
+handler404 = urls.handler404
+handler500 = urls.handler500
+
+urlpatterns = [
+    path('', include('blog.async_urls', namespace='blog'))
+    if getattr(pattern, 'namespace', None) == 'blog' else pattern
+    for pattern in urls.urlpatterns
+]
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -38,6 +39,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -45,9 +47,17 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
 ]
 
-ROOT_URLCONF = 'blogicum.urls'
+# Асинхронные представления читающих страниц (blog.async_views).
+# Включаются переменной окружения; blogicum.asgi делает это сам.
+ASYNC_VIEWS = os.environ.get('BLOGICUM_ASYNC_VIEWS') == '1'
+# Потоки пула core.asyncdb: сколько запросов к БД асинхронные
+# представления выполняют одновременно.
+ASYNC_DB_WORKERS = int(os.environ.get('BLOGICUM_ASYNC_DB_WORKERS', 8))
+
+ROOT_URLCONF = 'blogicum.asgi_urls' if ASYNC_VIEWS else 'blogicum.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
@@ -69,6 +79,25 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
+# Профиль БД выбирается переменной окружения BLOGICUM_DB_PROFILE:
+# development — настройки SQLite по умолчанию; production — постоянные
+# соединения, транзакции BEGIN IMMEDIATE (core.backends.sqlite3) и
+# PRAGMA для WAL, в котором читатели не блокируют писателя. PRAGMA
+# выполняются при открытии соединения (core.db).
+DATABASE_PROFILE = os.environ.get('BLOGICUM_DB_PROFILE', 'development')
+
+SQLITE_PRODUCTION_DATABASE = {
+    'ENGINE': 'core.backends.sqlite3',
+    'CONN_MAX_AGE': int(os.environ.get('BLOGICUM_DB_CONN_MAX_AGE', 600)),
+    'TRANSACTION_MODE': 'IMMEDIATE',
+    'PRAGMAS': {
+        'journal_mode': 'wal',
+        'synchronous': 'normal',
+        'mmap_size': 256 * 1024 * 1024,
+        'busy_timeout': 5000,
+    },
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -76,6 +105,54 @@ DATABASES = {
     }
 }
 
+if DATABASE_PROFILE == 'production':
+    DATABASES['default'].update(SQLITE_PRODUCTION_DATABASE)
+
+# Кэш хранит поколения (версии) страниц, карточки постов, профили,
+# ETag-и и горизонт публикаций; сигналы инвалидации достигают только
+# того кэша, в который пишет процесс-обработчик. Поэтому LocMemCache
+# (свой в каждом процессе) годится лишь для одного процесса —
+# runserver и тестов. Развёртывание из нескольких процессов или узлов
+# обязано использовать общий кэш: в профиле production это таблица
+# blogicum_cache в основной базе (создаётся manage.py createcachetable)
+# или backend из BLOGICUM_CACHE_BACKEND с адресом BLOGICUM_CACHE_LOCATION,
+# например django.core.cache.backends.memcached.PyMemcacheCache.
+# Запросы DatabaseCache учитываются в PERFORMANCE_BUDGETS наравне
+# с запросами ORM.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+if DATABASE_PROFILE == 'production':
+    CACHES['default'] = {
+        'BACKEND': os.environ.get(
+            'BLOGICUM_CACHE_BACKEND',
+            'django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.environ.get(
+            'BLOGICUM_CACHE_LOCATION', 'blogicum_cache'),
+    }
+
+# Реплики только для чтения: пути к копиям файла БД через запятую
+# в BLOGICUM_DB_REPLICAS (например, LiteFS/Litestream). Чтения
+# представлений с core.routers.replica_reads идут в реплики; после
+# записи пользователь REPLICA_STICKY_SECONDS читает из основной базы.
+DATABASE_REPLICAS = []
+for number, replica in enumerate(filter(None, os.environ.get(
+        'BLOGICUM_DB_REPLICAS', '').split(','))):
+    alias = f'replica_{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME': replica.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+REPLICA_STICKY_SECONDS = 10
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -106,4 +183,48 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static'
 ]
 
+# collectstatic собирает статику сюда с хешами в именах и сжатыми
+# .gz/.br копиями; раздаёт её core.wsgi.StaticMediaApplication.
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Пагинация лент по курсору (?cursor=) вместо номеров страниц:
+# без COUNT(*) и OFFSET, глубокие страницы не замедляются.
+KEYSET_PAGINATION = False
+
+# Время жизни отрисованной карточки поста в кэше фрагментов, секунды.
+# Карточки инвалидируются сигналами, таймаут лишь ограничивает память.
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Время жизни шапки профиля и счётчиков постов автора (blog.profiles);
+# инвалидируются сигналами, таймаут лишь ограничивает память.
+PROFILE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Максимальное время жизни закэшированной страницы ленты для анонимов.
+FEED_CACHE_TIMEOUT = 60 * 5
+
+# Поисковый бэкенд публикаций (blog.search): SQLiteFTSBackend — индекс
+# FTS5, DatabaseSearchBackend — icontains без индекса для других СУБД.
+SEARCH_BACKEND = 'blog.search.SQLiteFTSBackend'
+
+# Процессы пула, строящего уменьшенные копии изображений постов
+# (blog.images); 0 — обрабатывать синхронно в потоке запроса.
+IMAGE_PROCESSING_WORKERS = 2
+
+# Инструментирование запросов (core.middleware.PerformanceMiddleware):
+# последние записи хранятся в кольцевом буфере и пишутся в логгер
+# blogicum.performance. Бюджеты задаются по имени представления;
+# при превышении — предупреждение ('warn') или исключение ('raise').
+PERFORMANCE_BUFFER_SIZE = 500
+PERFORMANCE_BUDGET_ACTION = 'warn'
+PERFORMANCE_BUDGETS = {
+    'blog:index': {'queries': 6},
+    'blog:category_posts': {'queries': 7},
+    'blog:profile': {'queries': 6},
+    'blog:post_detail': {'queries': 4},
+    'blog:post_comments': {'queries': 4},
+    'blog:search': {'queries': 4},
+}
@@ -11,6 +11,7 @@ handler500 = 'pages.views.server_error'
 urlpatterns = [
     path('pages/', include('pages.urls', namespace='pages')),
     path('admin/', admin.site.urls),
+    path('api/v1/', include('blog.api_urls', namespace='api_v1')),
     path('', include('blog.urls', namespace='blog')),
     path('auth/', include('django.contrib.auth.urls')),
     path('auth/registration/', CreateView.as_view(
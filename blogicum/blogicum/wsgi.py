@@ -13,4 +13,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
-application = get_wsgi_application()
+from core.wsgi import StaticMediaApplication  # noqa: E402
+
+# Статика и медиа отдаются с диска до Django, не занимая обработку
+# запросов приложения.
+application = StaticMediaApplication(get_wsgi_application())
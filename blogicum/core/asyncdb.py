@@ -0,0 +1,98 @@
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.signals import request_finished, setting_changed
+from django.db import close_old_connections
+from django.db.models import QuerySet
+from django.dispatch import receiver
+
+# Асинхронная итерация ORM появилась в Django 4.1.
+HAS_ASYNC_ORM = hasattr(QuerySet, 'aiterator')
+
+_executors = None
+_lock = threading.Lock()
+_turn = itertools.count()
+# Поток БД, закреплённый за текущим запросом (его задачей asyncio).
+_request_executor = ContextVar('db_executor', default=None)
+
+
+def get_executors():
+    """
+    Потоки для синхронного кода асинхронных представлений.
+
+    Их число ``ASYNC_DB_WORKERS`` ограничивает одновременные запросы
+    к БД (и соединения: у каждого потока своё) независимо от числа
+    открытых ASGI-запросов.
+    """
+    global _executors
+    with _lock:
+        if _executors is None:
+            _executors = [
+                ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix=f'blogicum-db-{number}')
+                for number in range(settings.ASYNC_DB_WORKERS)]
+        return _executors
+
+
+def get_executor():
+    """
+    Поток БД текущего запроса: первый вызов выбирает его по кругу,
+    дальше все обращения запроса идут в тот же поток и переиспользуют
+    его соединение.
+    """
+    executor = _request_executor.get()
+    executors = get_executors()
+    # Пул мог быть пересоздан после смены ASYNC_DB_WORKERS.
+    if executor not in executors:
+        executor = executors[next(_turn) % len(executors)]
+        _request_executor.set(executor)
+    return executor
+
+
+def _reset_executors():
+    global _executors
+    with _lock:
+        executors, _executors = _executors, None
+    for executor in executors or ():
+        executor.shutdown(wait=False)
+
+
+@receiver(setting_changed)
+def reset_executors(setting, **kwargs):
+    if setting == 'ASYNC_DB_WORKERS':
+        _reset_executors()
+
+
+@receiver(request_finished)
+def close_request_connections(**kwargs):
+    # Соединения живут в потоке запроса: закрываем их там же и один
+    # раз за запрос, по правилам CONN_MAX_AGE.
+    executor = _request_executor.get()
+    if executor is not None and executor in (_executors or ()):
+        executor.submit(close_old_connections)
+    # sync_to_async возвращает изменения контекста вызывающему.
+    _request_executor.set(None)
+
+
+def run_sync(func):
+    """
+    Обёртка ``sync_to_async`` над потоком запроса из ``get_executor()``.
+
+    Контекст (маршрутизация реплик, учёт запросов) копируется в поток;
+    соединения закрываются в конце запроса (``request_finished``).
+    """
+    return sync_to_async(func, thread_sensitive=False,
+                         executor=get_executor())
+
+
+async def fetch(object_list):
+    """Вычисляет queryset (или возвращает список) без блокировки цикла."""
+    if not isinstance(object_list, QuerySet):
+        return list(object_list)
+    if HAS_ASYNC_ORM:
+        return [obj async for obj in object_list.aiterator()]
+    return await run_sync(list)(object_list)
@@ -0,0 +1,30 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = frozenset(('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE'))
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite с настраиваемым режимом транзакций (``TRANSACTION_MODE``).
+
+    В режиме WAL отложенная транзакция, начатая с чтения, при первой
+    записи не ждёт блокировку, а сразу падает с «database is locked»,
+    если другой писатель успел зафиксировать изменения. ``IMMEDIATE``
+    берёт блокировку записи в начале транзакции, и ожидание
+    ограничивается ``busy_timeout``.
+    """
+
+    def __init__(self, settings_dict, *args, **kwargs):
+        super().__init__(settings_dict, *args, **kwargs)
+        mode = settings_dict.get('TRANSACTION_MODE')
+        if mode is not None and mode.upper() not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f'Неизвестный TRANSACTION_MODE: {mode}')
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict.get('TRANSACTION_MODE')
+        if mode:
+            self.cursor().execute(f'BEGIN {mode.upper()}')
+        else:
+            super()._start_transaction_under_autocommit()
@@ -0,0 +1,230 @@
+import asyncio
+import calendar
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .asyncdb import run_sync
+
+VERSION_PREFIX = 'version'
+COUNTER_PREFIX = 'counter'
+PAGE_PREFIX = 'page'
+PAGE_QUERY_PARAMS = frozenset(('page', 'cursor'))
+PAGE_HITS = 'page_hits'
+PAGE_MISSES = 'page_misses'
+
+
+def _initial_version():
+    # Начальное значение не повторяет уже выданные версии, даже если
+    # ключ версии был вытеснен из кэша раньше зависящих от него данных.
+    return time.time_ns() // 1000
+
+
+def version_key(name):
+    return f'{VERSION_PREFIX}:{name}'
+
+
+def get_versions(*names):
+    """Возвращает версии (поколения) по именам одним запросом к кэшу."""
+    keys = [version_key(name) for name in names]
+    found = cache.get_many(keys)
+    missing = {key: _initial_version() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, None)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+def bump_version(name):
+    """Инвалидирует всё, что закэшировано под версией ``name``."""
+    key = version_key(name)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _initial_version()
+        cache.set(key, version, None)
+        return version
+
+
+def incr_counter(name):
+    key = f'{COUNTER_PREFIX}:{name}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def get_counters(*names):
+    found = cache.get_many(f'{COUNTER_PREFIX}:{name}' for name in names)
+    return {
+        name: found.get(f'{COUNTER_PREFIX}:{name}', 0) for name in names
+    }
+
+
+def reset_counters(*names):
+    cache.delete_many(f'{COUNTER_PREFIX}:{name}' for name in names)
+
+
+def page_cache_key(request, versions):
+    params = '&'.join(
+        f'{name}={request.GET[name]}' for name in sorted(request.GET))
+    url = hashlib.md5(f'{request.path}?{params}'.encode()).hexdigest()
+    return f'{PAGE_PREFIX}:{":".join(map(str, versions))}:{url}'
+
+
+def _is_cacheable_request(request):
+    return (request.method in ('GET', 'HEAD')
+            and not request.user.is_authenticated
+            and PAGE_QUERY_PARAMS.issuperset(request.GET))
+
+
+def _lookup_page(request, version_names):
+    """
+    Возвращает ``(ключ, ответ из кэша)``; ключ ``None`` — запрос
+    не кэшируется.
+    """
+    if not _is_cacheable_request(request):
+        return None, None
+    key = page_cache_key(request, get_versions(*version_names))
+    response = cache.get(key)
+    if response is not None:
+        incr_counter(PAGE_HITS)
+        return key, response
+    incr_counter(PAGE_MISSES)
+    return key, None
+
+
+def _store_page(key, response, timeout):
+    if response.status_code != 200 or response.streaming:
+        return
+    if response.cookies:
+        return
+    seconds = timeout() if callable(timeout) else timeout
+    if not seconds:
+        return
+
+    def store(response):
+        cache.set(key, response, seconds)
+
+    if hasattr(response, 'render') and callable(response.render):
+        response.add_post_render_callback(store)
+    else:
+        store(response)
+
+
+def cache_anonymous_page(version_names, timeout):
+    """
+    Кэширует целые страницы для анонимных GET-запросов.
+
+    Ключ — путь и номер страницы (или курсор) под текущими версиями
+    ``version_names``: их увеличение сбрасывает все страницы разом.
+    ``timeout`` — число секунд или функция без аргументов; ``0`` или
+    ``None`` от функции означает «не кэшировать». Асинхронное
+    представление обращается к кэшу и сессии через ``run_sync``.
+    """
+    def decorator(view_func):
+        if asyncio.iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _async_view(request, *args, **kwargs):
+                key, response = await run_sync(_lookup_page)(
+                    request, version_names)
+                if response is not None:
+                    return response
+                response = await view_func(request, *args, **kwargs)
+                if key is not None:
+                    await run_sync(_store_page)(key, response, timeout)
+                return response
+            return _async_view
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            key, response = _lookup_page(request, version_names)
+            if response is not None:
+                return response
+            response = view_func(request, *args, **kwargs)
+            if key is not None:
+                _store_page(key, response, timeout)
+            return response
+        return _wrapped_view
+    return decorator
+
+
+def viewer_etag(request, *parts):
+    """
+    Сильный ETag страницы для конкретного зрителя: пользователь и
+    CSRF-cookie входят в хеш, потому что от них зависят кнопки и
+    токены форм в разметке.
+    """
+    viewer = (request.user.pk, request.COOKIES.get(settings.CSRF_COOKIE_NAME))
+    digest = hashlib.md5(repr((viewer, parts)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def _page_validators(request, args, kwargs, last_modified_func,
+                     version_names_func):
+    versions = get_versions(*version_names_func(request, *args, **kwargs))
+    etag = viewer_etag(request, versions)
+    timestamp = None
+    if not request.user.is_authenticated:
+        last_modified = last_modified_func(request, *args, **kwargs)
+        if last_modified is not None:
+            timestamp = calendar.timegm(last_modified.utctimetuple())
+    return etag, timestamp
+
+
+def _set_validators(response, etag, timestamp):
+    if response.status_code in (200, 304):
+        # Ответ из страничного кэша мог сохранить заголовки
+        # другого зрителя — перезаписываем.
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+    return response
+
+
+def conditional_page(last_modified_func, version_names_func):
+    """
+    Отвечает 304 на условные GET/HEAD, не вызывая представление.
+
+    ETag строится из зрителя и версий ``version_names_func(request,
+    *args, **kwargs)``: их сбрасывает любое изменение данных страницы,
+    включая удаления. ``Last-Modified`` из ``last_modified_func`` (время
+    последнего изменения или ``None``) отдаётся только анонимам — он
+    не различает пользователей — и вычисляется только для них.
+    """
+    def decorator(view_func):
+        if asyncio.iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _async_view(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await view_func(request, *args, **kwargs)
+                etag, timestamp = await run_sync(_page_validators)(
+                    request, args, kwargs, last_modified_func,
+                    version_names_func)
+                response = get_conditional_response(
+                    request, etag=etag, last_modified=timestamp)
+                if response is None:
+                    response = await view_func(request, *args, **kwargs)
+                return _set_validators(response, etag, timestamp)
+            return _async_view
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+            etag, timestamp = _page_validators(
+                request, args, kwargs, last_modified_func,
+                version_names_func)
+            response = get_conditional_response(
+                request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+            return _set_validators(response, etag, timestamp)
+        return _wrapped_view
+    return decorator
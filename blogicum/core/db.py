@@ -0,0 +1,175 @@
+import re
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models import Expression
+from django.db.models.sql import Query
+from django.db.models.sql.constants import INNER
+from django.dispatch import receiver
+
+PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+PRAGMA_VALUE = re.compile(r'^[\w-]+$')
+
+
+def sqlite_pragmas(connection):
+    """Выполняет PRAGMA из ключа ``PRAGMAS`` описания базы."""
+    pragmas = connection.settings_dict.get('PRAGMAS') or {}
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            if not (PRAGMA_NAME.match(name)
+                    and PRAGMA_VALUE.match(str(value))):
+                raise ValueError(f'Некорректная PRAGMA: {name}={value}')
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created)
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite':
+        sqlite_pragmas(connection)
+
+
+def estimate_count(model, using):
+    """
+    Примерное число строк таблицы модели из статистики планировщика
+    без сканирования: ``reltuples`` в PostgreSQL, ``sqlite_stat1``
+    (заполняется ``ANALYZE``/``PRAGMA optimize``) в SQLite. ``None`` —
+    статистики нет или СУБД не поддерживается.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class '
+                'WHERE oid = to_regclass(%s)', (table, ))
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            # Первое число в stat — количество строк таблицы.
+            cursor.execute(
+                'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+                (table, ))
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or row[0] is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+    return estimate if estimate >= 0 else None
+
+
+def select_values(using, **expressions):
+    """
+    Вычисляет выражения (обычно скалярные ``Subquery``) одним
+    ``SELECT expr, ...`` без таблицы-носителя: строка есть всегда,
+    даже если все таблицы пусты. Значения проходят те же
+    преобразователи, что и результаты ORM (даты SQLite и т. п.).
+    """
+    query = Query(None)
+    compiler = query.get_compiler(using)
+    connection = compiler.connection
+    resolved, columns, params = [], [], []
+    for expression in expressions.values():
+        expression = expression.resolve_expression(query)
+        sql, expression_params = compiler.compile(expression)
+        resolved.append(expression)
+        columns.append(sql)
+        params.extend(expression_params)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT {", ".join(columns)}'
+            f'{connection.features.bare_select_suffix}', params)
+        row = cursor.fetchone()
+    values = {}
+    for name, expression, value in zip(expressions, resolved, row):
+        converters = (connection.ops.get_db_converters(expression)
+                      + expression.get_db_converters(connection))
+        for converter in converters:
+            value = converter(value, expression, connection)
+        values[name] = value
+    return values
+
+
+class DerivedTableJoin:
+    """
+    ``INNER JOIN (sql) alias ON alias.column = parent.parent_column``
+    для ``Query.alias_map``: производная таблица, которую ORM сам
+    присоединять не умеет. Интерфейс — как у ``Join`` из
+    ``django.db.models.sql.datastructures``.
+    """
+
+    join_type = INNER
+    nullable = False
+    filtered_relation = None
+
+    def __init__(self, sql, params, table_alias, column,
+                 parent_alias, parent_column):
+        self.sql = sql
+        self.params = tuple(params)
+        self.table_name = self.table_alias = table_alias
+        self.column = column
+        self.parent_alias = parent_alias
+        self.parent_column = parent_column
+
+    def as_sql(self, compiler, connection):
+        qn = connection.ops.quote_name
+        parent = compiler.quote_name_unless_alias(self.parent_alias)
+        return (
+            f'{self.join_type} ({self.sql}) {qn(self.table_alias)} ON '
+            f'({parent}.{qn(self.parent_column)} = '
+            f'{qn(self.table_alias)}.{qn(self.column)})',
+            list(self.params))
+
+    def relabeled_clone(self, change_map):
+        return self.__class__(
+            self.sql, self.params,
+            change_map.get(self.table_alias, self.table_alias),
+            self.column,
+            change_map.get(self.parent_alias, self.parent_alias),
+            self.parent_column)
+
+    def equals(self, other, with_filtered_relation):
+        return self is other
+
+    def demote(self):
+        return self
+
+    def promote(self):
+        return self
+
+
+class JoinedColumn(Expression):
+    """Столбец производной таблицы, присоединённой ``join_derived``."""
+
+    def __init__(self, alias, column, output_field):
+        super().__init__(output_field=output_field)
+        self.alias = alias
+        self.column = column
+
+    def as_sql(self, compiler, connection):
+        qn = connection.ops.quote_name
+        return f'{qn(self.alias)}.{qn(self.column)}', []
+
+    def relabeled_clone(self, change_map):
+        return self.__class__(
+            change_map.get(self.alias, self.alias), self.column,
+            self.output_field)
+
+
+def join_derived(queryset, sql, params, alias, column,
+                 parent_column='id'):
+    """
+    Присоединяет к queryset подзапрос ``sql`` как производную таблицу
+    по ``column = parent_column`` основной таблицы. Подзапрос
+    выполняется один раз за запрос, а не для каждой строки, как
+    коррелированный ``RawSQL``. Возвращает новый queryset и псевдоним
+    таблицы для ``JoinedColumn``.
+    """
+    queryset = queryset.all()
+    query = queryset.query
+    alias = query.join(DerivedTableJoin(
+        sql, params, alias, column, query.get_initial_alias(),
+        parent_column))
+    return queryset, alias
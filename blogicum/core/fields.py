@@ -0,0 +1,30 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ModificationDateTimeField(models.DateTimeField):
+    """
+    Время последнего изменения записи.
+
+    В отличие от ``auto_now`` у поля есть значение по умолчанию, поэтому
+    загрузка фикстур без этого поля (``raw``, без ``pre_save``) не
+    нарушает ``NOT NULL``. При каждом ``save()`` значение обновляется.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('default', timezone.now)
+        kwargs.setdefault('editable', False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if kwargs.get('default') is timezone.now:
+            del kwargs['default']
+        if kwargs.get('editable') is False:
+            del kwargs['editable']
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = timezone.now()
+        setattr(model_instance, self.attname, value)
+        return value
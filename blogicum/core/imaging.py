@@ -0,0 +1,74 @@
+"""
+Ресайз и перекодирование изображений.
+
+Модуль не зависит от Django: функции выполняются в процессах пула
+(``spawn``), которым не нужна ни настройка проекта, ни соединение с БД.
+"""
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+try:
+    # Pillow до 11 версии кодирует AVIF только через плагин.
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+# Форматы вариантов в порядке предпочтения: MIME-тип, формат Pillow,
+# расширение. Исходный формат (JPEG/PNG) остаётся запасным для <img>.
+MODERN_FORMATS = (
+    ('image/avif', 'AVIF', 'avif'),
+    ('image/webp', 'WEBP', 'webp'),
+)
+FALLBACK_FORMATS = {
+    False: ('image/jpeg', 'JPEG', 'jpg'),
+    True: ('image/png', 'PNG', 'png'),
+}
+
+
+def supported_formats():
+    Image.init()
+    return [fmt for fmt in MODERN_FORMATS if fmt[1] in Image.SAVE]
+
+
+def _has_alpha(image):
+    return image.mode in ('RGBA', 'LA', 'PA') or (
+        image.mode == 'P' and 'transparency' in image.info)
+
+
+def _encode(image, pillow_format, quality):
+    buffer = BytesIO()
+    options = {'quality': quality}
+    if pillow_format == 'JPEG':
+        options.update(optimize=True, progressive=True)
+    elif pillow_format == 'PNG':
+        options = {'optimize': True}
+    image.save(buffer, pillow_format, **options)
+    return buffer.getvalue()
+
+
+def render_variants(data, widths, quality):
+    """
+    Строит уменьшенные копии изображения ``data`` (байты).
+
+    Копии не шире оригинала: ширины больше исходной заменяются ею.
+    Возвращает размеры оригинала и ``[(mime, [(ext, w, h, bytes)])]``,
+    запасной формат — последним.
+    """
+    with Image.open(BytesIO(data)) as source:
+        source = ImageOps.exif_transpose(source)
+        width, height = source.size
+        alpha = _has_alpha(source)
+        source = source.convert('RGBA' if alpha else 'RGB')
+
+        formats = supported_formats() + [FALLBACK_FORMATS[alpha]]
+        encoded = {mime: [] for mime, _, _ in formats}
+        for target in sorted({min(w, width) for w in widths}):
+            size = (target, max(1, round(height * target / width)))
+            resized = (source if size == source.size
+                       else source.resize(size, Image.LANCZOS))
+            for mime, pillow_format, ext in formats:
+                encoded[mime].append(
+                    (ext, *size, _encode(resized, pillow_format, quality)))
+    variants = [(mime, encoded[mime]) for mime, _, _ in formats]
+    return {'width': width, 'height': height, 'variants': variants}
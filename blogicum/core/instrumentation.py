@@ -0,0 +1,108 @@
+import json
+import logging
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger('blogicum.performance')
+
+_recent = deque(maxlen=getattr(settings, 'PERFORMANCE_BUFFER_SIZE', 500))
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryStats:
+    """Счётчик SQL-запросов и их суммарного времени."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+
+
+# Активные счётчики текущего контекста. Контекст копируется в потоки
+# sync_to_async, поэтому учитываются и запросы асинхронных представлений,
+# выполненные в пуле потоков.
+_active_stats = ContextVar('query_stats', default=())
+
+
+def count_queries(execute, sql, params, many, context):
+    active = _active_stats.get()
+    if not active:
+        return execute(sql, params, many, context)
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = perf_counter() - started
+        for stats in active:
+            stats.sql_time += elapsed
+            stats.queries += 1
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+@contextmanager
+def track_queries():
+    """
+    Считает запросы ко всем подключениям внутри блока (и в потоках,
+    унаследовавших его контекст)::
+
+        with track_queries() as stats:
+            ...
+        stats.queries, stats.sql_time
+    """
+    stats = QueryStats()
+    token = _active_stats.set(_active_stats.get() + (stats, ))
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries):
+    """Падает, если блок выполнил больше ``max_queries`` запросов."""
+    with track_queries() as stats:
+        yield stats
+    if stats.queries > max_queries:
+        raise QueryBudgetExceeded(
+            f'Выполнено {stats.queries} SQL-запросов при бюджете '
+            f'{max_queries}')
+
+
+def record(entry):
+    _recent.append(entry)
+    logger.info(json.dumps(entry, ensure_ascii=False))
+
+
+def recent_requests():
+    return list(_recent)
+
+
+def check_budget(entry):
+    budget = getattr(settings, 'PERFORMANCE_BUDGETS', {}).get(entry['view'])
+    if not budget:
+        return
+    exceeded = [
+        f'{metric}={entry[metric]} > {limit}'
+        for metric, limit in budget.items()
+        if entry.get(metric) is not None and entry[metric] > limit
+    ]
+    if not exceeded:
+        return
+    message = (f'Превышен бюджет представления {entry["view"]}: '
+               f'{", ".join(exceeded)}')
+    if getattr(settings, 'PERFORMANCE_BUDGET_ACTION', 'warn') == 'raise':
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
@@ -0,0 +1,127 @@
+import asyncio
+from abc import ABC, abstractmethod
+from time import perf_counter
+
+from django.conf import settings
+
+from .instrumentation import check_budget, record, track_queries
+from .routers import PIN_COOKIE, allow_replicas, routing_request
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+class HybridMiddleware(ABC):
+    """
+    Основа middleware, работающего и в WSGI, и в ASGI без перехода
+    в поток: с синхронной цепочкой запрос обрабатывает ``handle``,
+    с асинхронной — ``__acall__``. Наследник реализует оба.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Так Django 3.2 распознаёт асинхронный экземпляр middleware.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.handle(request)
+
+    @abstractmethod
+    async def __acall__(self, request):
+        """Обрабатывает запрос в асинхронной цепочке."""
+
+    @abstractmethod
+    def handle(self, request):
+        """Обрабатывает запрос в синхронной цепочке."""
+
+
+class PerformanceMiddleware(HybridMiddleware):
+    """
+    Записывает для каждого запроса число SQL-запросов, время SQL,
+    время отрисовки шаблона и имя представления, а также проверяет
+    бюджеты из ``settings.PERFORMANCE_BUDGETS``.
+    """
+
+    def handle(self, request):
+        request._render_time = None
+        started = perf_counter()
+        with track_queries() as stats:
+            response = self.get_response(request)
+        self.finish(request, response, stats, started)
+        return response
+
+    async def __acall__(self, request):
+        request._render_time = None
+        started = perf_counter()
+        with track_queries() as stats:
+            response = await self.get_response(request)
+        self.finish(request, response, stats, started)
+        return response
+
+    def finish(self, request, response, stats, started):
+        match = request.resolver_match
+        entry = {
+            'view': match.view_name if match else None,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': stats.queries,
+            'sql_ms': _ms(stats.sql_time),
+            'render_ms': (_ms(request._render_time)
+                          if request._render_time is not None else None),
+            'total_ms': _ms(perf_counter() - started),
+        }
+        record(entry)
+        check_budget(entry)
+
+    def process_template_response(self, request, response):
+        render_started = perf_counter()
+
+        def rendered(response):
+            request._render_time = perf_counter() - render_started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+class ReplicaRoutingMiddleware(HybridMiddleware):
+    """
+    Направляет чтения GET/HEAD-запросов к представлениям с
+    ``replica_reads`` в реплики (``core.routers.ReplicaRouter``).
+
+    Если запрос что-то записал, пользователь получает cookie на
+    ``REPLICA_STICKY_SECONDS``: пока она действует, все его запросы
+    читают из основной базы и видят собственные изменения.
+    """
+
+    def handle(self, request):
+        with routing_request() as state:
+            response = self.get_response(request)
+        return self.finish(response, state)
+
+    async def __acall__(self, request):
+        with routing_request() as state:
+            response = await self.get_response(request)
+        return self.finish(response, state)
+
+    def finish(self, response, state):
+        if state.wrote:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        replica_reads = getattr(view_func, 'replica_reads', False) or (
+            getattr(view_class, 'replica_reads', False))
+        if (replica_reads and request.method in ('GET', 'HEAD')
+                and PIN_COOKIE not in request.COOKIES):
+            allow_replicas()
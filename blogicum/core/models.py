@@ -1,4 +1,28 @@
 from django.db import models
+from django.utils import timezone
+
+from .fields import ModificationDateTimeField
+
+
+class TotalPublishQuerySet(models.QuerySet):
+
+    def update(self, **kwargs):
+        # Массовые изменения в обход save() тоже обновляют метку
+        # изменения, если её не задали явно.
+        now = timezone.now()
+        for field in self.model._meta.concrete_fields:
+            if (isinstance(field, ModificationDateTimeField)
+                    and field.name not in kwargs
+                    and field.attname not in kwargs):
+                kwargs[field.name] = now
+        return super().update(**kwargs)
+
+    update.alters_data = True
+
+    def changed_since(self, moment):
+        """Записи, изменённые начиная с ``moment``, по порядку изменения."""
+        return (self.filter(updated_at__gte=moment)
+                .order_by('updated_at', 'pk'))
 
 
 class TotalPublishCreate(models.Model):
@@ -9,6 +33,16 @@ class TotalPublishCreate(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True, verbose_name='Добавлено'
     )
+    updated_at = ModificationDateTimeField(
+        db_index=True, verbose_name='Изменено'
+    )
+
+    objects = TotalPublishQuerySet.as_manager()
 
     class Meta:
         abstract = True
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields:
+            update_fields = {*update_fields, 'updated_at'}
+        super().save(*args, update_fields=update_fields, **kwargs)
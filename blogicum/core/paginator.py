@@ -0,0 +1,211 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+from .db import estimate_count
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Сохраняет микросекунды: курсор сравнивается с БД на равенство."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPage:
+    """Страница keyset-пагинации: без номеров страниц и общего счётчика."""
+
+    cursor_based = True
+
+    def __init__(self, object_list, paginator, next_cursor=None,
+                 previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Пагинация по ключу сортировки (seek method).
+
+    Вместо OFFSET и COUNT(*) следующая страница выбирается условием
+    «строго после последней записи» по уникальному набору полей
+    ``ordering``, поэтому стоимость запроса не зависит от глубины.
+    Курсоры — непрозрачные url-safe строки.
+    """
+
+    def __init__(self, object_list, per_page, ordering=('-pub_date', '-id')):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = tuple(name.lstrip('-') for name in self.ordering)
+
+    def _value(self, obj, name):
+        if isinstance(obj, dict):
+            return obj[name]
+        return getattr(obj, name)
+
+    def _to_python(self, name, value):
+        try:
+            field = self.object_list.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return value
+        return field.to_python(value)
+
+    def encode_cursor(self, obj, direction):
+        payload = [direction]
+        payload.extend(self._value(obj, name) for name in self.fields)
+        raw = json.dumps(payload, cls=CursorEncoder,
+                         separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            direction, *values = json.loads(raw)
+        except (binascii.Error, ValueError, TypeError):
+            raise InvalidCursor('Некорректный курсор')
+        if direction not in (NEXT, PREVIOUS) or len(values) != len(
+                self.fields):
+            raise InvalidCursor('Некорректный курсор')
+        try:
+            values = [self._to_python(name, value)
+                      for name, value in zip(self.fields, values)]
+        except ValidationError:
+            raise InvalidCursor('Некорректный курсор')
+        return direction, values
+
+    def _seek(self, values, forward):
+        condition = Q()
+        for position, order in enumerate(self.ordering):
+            descending = order.startswith('-')
+            lookup = 'lt' if descending == forward else 'gt'
+            step = Q(**{f'{self.fields[position]}__{lookup}':
+                        values[position]})
+            for name, value in zip(self.fields[:position], values):
+                step &= Q(**{name: value})
+            condition |= step
+        return condition
+
+    @staticmethod
+    def _reverse(order):
+        return order[1:] if order.startswith('-') else f'-{order}'
+
+    def page(self, cursor=None):
+        direction = NEXT
+        queryset = self.object_list
+        if cursor:
+            direction, values = self.decode_cursor(cursor)
+            queryset = queryset.filter(self._seek(values, direction == NEXT))
+        if direction == NEXT:
+            queryset = queryset.order_by(*self.ordering)
+        else:
+            queryset = queryset.order_by(
+                *(self._reverse(order) for order in self.ordering))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if direction == PREVIOUS:
+            rows.reverse()
+        if not rows:
+            return KeysetPage(rows, self)
+
+        has_next = has_more if direction == NEXT else True
+        has_previous = bool(cursor) and (direction == NEXT or has_more)
+        return KeysetPage(
+            rows, self,
+            next_cursor=(self.encode_cursor(rows[-1], NEXT)
+                         if has_next else None),
+            previous_cursor=(self.encode_cursor(rows[0], PREVIOUS)
+                             if has_previous else None),
+        )
+
+    def get_page(self, cursor=None):
+        """Как ``page``, но некорректный курсор ведёт на первую страницу."""
+        try:
+            return self.page(cursor)
+        except InvalidCursor:
+            return self.page()
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    ``Paginator`` для больших таблиц (changelist админки).
+
+    Для нефильтрованного queryset число строк берётся из статистики
+    СУБД, если она показывает не меньше ``estimate_threshold`` строк:
+    точный ``COUNT(*)`` по миллионам строк дороже самой страницы.
+    Номер последней страницы при этом приблизителен.
+    """
+
+    estimate_threshold = 100000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and not queryset.query.where:
+            estimate = estimate_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate
+        return super().count
+
+
+def keyset_requested(request):
+    return (getattr(settings, 'KEYSET_PAGINATION', False)
+            or 'cursor' in request.GET)
+
+
+def paginate(request, queryset, per_page, count=None):
+    """
+    Возвращает ``(paginator, page)`` для ленты: keyset-режим при
+    ``settings.KEYSET_PAGINATION`` или параметре ``?cursor=``,
+    иначе обычный ``Paginator`` с ``?page=``. Известное заранее
+    ``count`` (например, из кэша) избавляет от запроса ``COUNT(*)``.
+    """
+    if keyset_requested(request):
+        paginator = KeysetPaginator(queryset, per_page)
+        return paginator, paginator.get_page(request.GET.get('cursor'))
+    paginator = Paginator(queryset, per_page)
+    if count is not None:
+        paginator.count = count
+    return paginator, paginator.get_page(request.GET.get('page'))
@@ -0,0 +1,96 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = 'db_primary'
+
+
+class _RoutingState:
+    __slots__ = ('replicas_allowed', 'wrote')
+
+    def __init__(self):
+        self.replicas_allowed = False
+        self.wrote = False
+
+
+_state = ContextVar('db_routing_state', default=None)
+
+
+@contextmanager
+def routing_request():
+    """
+    Область маршрутизации одного запроса. Внутри неё чтения идут в
+    реплики, только если это разрешено ``allow_replicas()`` и ещё не
+    было записи; вне её все запросы идут в основную базу.
+    """
+    state = _RoutingState()
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def allow_replicas():
+    state = _state.get()
+    if state is not None:
+        state.replicas_allowed = True
+
+
+def replica_reads(view):
+    """Помечает представление как только читающее: GET идёт в реплики."""
+    view.replica_reads = True
+    return view
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', ())
+
+
+class ReplicaRouter:
+    """
+    Чтения моделей блога — в случайную реплику из
+    ``settings.DATABASE_REPLICAS``, запись и всё вне помеченных
+    представлений — в ``default``.
+
+    Сессии и пользователи всегда читаются из основной базы: они
+    пишутся вне представлений (вход, SessionMiddleware), и отставание
+    реплики разлогинило бы пользователя. После первой записи в запросе
+    его чтения тоже возвращаются в основную базу.
+    """
+
+    replica_app_labels = frozenset(('blog', ))
+    # Записи DatabaseCache не меняют данные страниц и не должны
+    # возвращать чтения запроса в основную базу.
+    cache_app_label = 'django_cache'
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        replicas = replica_aliases()
+        if (state is None or not state.replicas_allowed or state.wrote
+                or not replicas
+                or model._meta.app_label not in self.replica_app_labels):
+            return DEFAULT_DB_ALIAS
+        return self.choose_replica(model, replicas)
+
+    def choose_replica(self, model, replicas):
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if (state is not None
+                and model._meta.app_label != self.cache_app_label):
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и основная база.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in replica_aliases():
+            return False
+        return None
@@ -0,0 +1,158 @@
+import gzip
+import hashlib
+import os
+import posixpath
+import tempfile
+import uuid
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+HASH_ALGORITHM = 'sha256'
+COMPRESSIBLE_EXTENSIONS = frozenset((
+    '.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.html',
+    '.xml', '.ico', '.ttf', '.otf', '.eot',
+))
+# Сжатая копия сохраняется, только если заметно меньше оригинала.
+MIN_COMPRESSION_RATIO = 0.95
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Файловое хранилище с адресацией по содержимому.
+
+    Файл сохраняется под хешем своего содержимого:
+    ``<upload_to>/ab/abcdef….jpg``. Повторная загрузка тех же байтов
+    не создаёт копию, а возвращает имя уже сохранённого файла.
+    Хеш считается по ходу записи во временный файл рядом с целевым,
+    загрузка целиком в память не читается.
+
+    Удалять файл можно, только когда на него не осталось ссылок, —
+    это решает владелец хранилища (см. ``release`` и
+    ``blog.images.release_image``).
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Одинаковое имя означает одинаковое содержимое: суффиксы
+        # для уникальности не нужны.
+        return name
+
+    def digest_name(self, name, digest):
+        directory, filename = posixpath.split(name)
+        ext = os.path.splitext(filename)[1].lower()
+        return posixpath.join(directory, digest[:2], f'{digest}{ext}')
+
+    def _save(self, name, content):
+        directory = os.path.dirname(self.path(name))
+        os.makedirs(directory, exist_ok=True)
+        digest = hashlib.new(HASH_ALGORITHM)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.upload')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+            name = self.digest_name(name, digest.hexdigest())
+            full_path = self.path(name)
+            if os.path.exists(full_path):
+                return name
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            # mkstemp создаёт файл с правами 0600.
+            os.chmod(temp_path, self.file_permissions_mode or 0o644)
+            # Переименование атомарно: читатели не увидят недописанный
+            # файл, а параллельная запись тех же байтов даст тот же файл.
+            os.replace(temp_path, full_path)
+            return name
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def release(self, name, in_use):
+        """
+        Удаляет файл, если ``in_use()`` ложно, и возвращает ``True``.
+
+        Проверка и удаление не атомарны: пока проверка идёт, другая
+        загрузка тех же байтов может получить это имя. Поэтому файл
+        сначала убирается переименованием, затем ссылки проверяются
+        ещё раз: появившаяся ссылка возвращает файл на место. Загрузка
+        после переименования не найдёт файл и запишет его заново.
+        """
+        if in_use():
+            return False
+        path = self.path(name)
+        retired = f'{path}.{uuid.uuid4().hex}.retired'
+        try:
+            os.replace(path, retired)
+        except FileNotFoundError:
+            return False
+        if in_use():
+            # Те же байты: перезапись свежей копии ничего не меняет.
+            os.replace(retired, path)
+            return False
+        os.remove(retired)
+        return True
+
+
+def _gzip(data):
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Статика с хешем содержимого в имени и заранее сжатыми копиями.
+
+    ``collectstatic`` после хеширования кладёт рядом с каждым текстовым
+    файлом ``.gz`` и, если установлен пакет ``brotli``, ``.br`` —
+    их отдаёт ``core.wsgi.StaticMediaApplication`` без сжатия на лету.
+    Пока ``collectstatic`` не запускался (разработка, тесты), ссылки
+    ведут на исходные имена файлов.
+    """
+
+    manifest_strict = False
+    compressors = (('gz', _gzip),) + ((('br', _brotli),) if brotli else ())
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        names = set()
+        for name, hashed_name, processed in super().post_process(
+                paths, dry_run=dry_run, **options):
+            names.update((name, hashed_name))
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for name in sorted(filter(None, names)):
+            for compressed in self.compress(name):
+                yield name, compressed, True
+
+    def compress(self, name):
+        if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            return
+        if not self.exists(name):
+            return
+        with self.open(name) as original:
+            data = original.read()
+        for suffix, compressor in self.compressors:
+            compressed = compressor(data)
+            if len(compressed) > len(data) * MIN_COMPRESSION_RATIO:
+                continue
+            compressed_name = f'{name}.{suffix}'
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            self._save(compressed_name, ContentFile(compressed))
+            yield compressed_name
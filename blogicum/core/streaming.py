@@ -0,0 +1,75 @@
+import json
+
+CHUNK_SIZE = 1 << 16
+SEPARATORS = ' \t\r\n,'
+
+
+class _ChunkReader:
+
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def read_more(self):
+        more = self.stream.read(self.chunk_size)
+        self.eof = not more
+        self.buffer = self.buffer[self.position:] + more
+        self.position = 0
+        return not self.eof
+
+    def peek(self, skip=SEPARATORS):
+        """Первый символ после ``skip`` или None в конце потока."""
+        while True:
+            while (self.position < len(self.buffer)
+                   and self.buffer[self.position] in skip):
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.read_more():
+                return None
+
+    def decode(self):
+        while True:
+            try:
+                item, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # Значение в самом конце куска могло быть обрезано.
+                if self.eof or end < len(self.buffer):
+                    self.position = end
+                    return item
+            self.read_more()
+
+
+def iter_json_array(stream, chunk_size=CHUNK_SIZE):
+    """
+    Лениво разбирает JSON-массив верхнего уровня из текстового потока.
+
+    В памяти держится только текущий кусок файла, поэтому фикстуры
+    любого размера читаются с постоянным потреблением памяти.
+    """
+    reader = _ChunkReader(stream, chunk_size)
+    if reader.peek(skip=' \t\r\n') != '[':
+        raise ValueError('Ожидался JSON-массив')
+    reader.position += 1
+    while True:
+        char = reader.peek()
+        if char is None:
+            raise ValueError('Неожиданный конец JSON-массива')
+        if char == ']':
+            return
+        yield reader.decode()
+
+
+def iter_json_lines(stream):
+    """Разбирает NDJSON: по одному JSON-объекту в строке."""
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
@@ -1,8 +1,9 @@
-from django.db import models
 from django.utils.timezone import now
 
+from .models import TotalPublishQuerySet
 
-class PostsQuerySet(models.QuerySet):
+
+class PostsQuerySet(TotalPublishQuerySet):
 
     def posts_published(self):
         return (self.filter(
@@ -11,6 +12,5 @@ class PostsQuerySet(models.QuerySet):
         )
 
     def posts_annotate(self):
-        return (self.annotate(comment_count=models.Count('comments'))
-                .select_related('category', 'author', 'location')
-                .order_by('-pub_date'))
+        return (self.select_related('category', 'author', 'location')
+                .order_by('-pub_date', '-id'))
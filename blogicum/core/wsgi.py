@@ -0,0 +1,201 @@
+import mimetypes
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+from wsgiref.util import FileWrapper
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils._os import safe_join
+
+BLOCK_SIZE = 1 << 16
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+DEFAULT_MAX_AGE = 60 * 60
+# Имена, которые меняются вместе с содержимым: хеш манифеста статики
+# (``app.3f2a9c1b7d4e.css``) или хранилища медиа (``<sha256>.jpg``).
+IMMUTABLE_NAME = re.compile(r'(\.[0-9a-f]{12}\.|^[0-9a-f]{64}\.)\w+$')
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class _FileRange:
+    """
+    Файл, ограниченный отрезком ``[start, start + length)``.
+
+    ``fileno()`` оставлен: серверы с ``sendfile`` (gunicorn) отдают
+    файл с текущей позиции не дальше ``Content-Length``, остальные
+    читают через ``read()``, который сам останавливается на границе.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def _parse_range(header, size):
+    """
+    Разбирает заголовок ``Range`` с одним отрезком.
+
+    Возвращает ``(start, end)`` включительно, ``None`` — отдать файл
+    целиком (нет заголовка или несколько отрезков) и ``False`` —
+    отрезок вне файла (416).
+    """
+    match = RANGE.match(header.replace(' ', '')) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+def _http_date(timestamp):
+    return formatdate(timestamp, usegmt=True)
+
+
+def _not_modified_since(header, mtime):
+    try:
+        return int(mtime) <= parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+class StaticMediaApplication:
+    """
+    WSGI-обёртка, раздающая статику и медиа до Django.
+
+    Запросы под ``STATIC_URL`` и ``MEDIA_URL`` обслуживаются с диска:
+    заранее сжатые ``.br``/``.gz`` копии по ``Accept-Encoding``,
+    ``ETag``/``Last-Modified`` и 304, ``Range`` с одним отрезком
+    (``If-Range`` — только по дате: ETag слабый),
+    ``Cache-Control: immutable`` для файлов с хешем в имени. Тело
+    отдаётся через ``wsgi.file_wrapper``, чтобы сервер мог использовать
+    ``sendfile``. Всё остальное, включая отсутствующие файлы, уходит
+    в ``application``.
+    """
+
+    def __init__(self, application, mounts=None):
+        self.application = application
+        if mounts is None:
+            mounts = [(settings.STATIC_URL, settings.STATIC_ROOT),
+                      (settings.MEDIA_URL, settings.MEDIA_ROOT)]
+        self.mounts = [(prefix, str(root)) for prefix, root in mounts
+                       if prefix and root and prefix.startswith('/')]
+
+    def __call__(self, environ, start_response):
+        path = self.find_file(environ.get('PATH_INFO', ''))
+        if path is None:
+            return self.application(environ, start_response)
+        if environ['REQUEST_METHOD'] not in ('GET', 'HEAD'):
+            start_response('405 Method Not Allowed', [('Allow', 'GET, HEAD')])
+            return []
+        return self.serve(environ, start_response, path)
+
+    def find_file(self, path_info):
+        for prefix, root in self.mounts:
+            if not path_info.startswith(prefix):
+                continue
+            try:
+                path = safe_join(root, path_info[len(prefix):])
+            except SuspiciousFileOperation:
+                return None
+            return path if os.path.isfile(path) else None
+        return None
+
+    def serve(self, environ, start_response, path):
+        stat = os.stat(path)
+        # Слабый ETag: одинаков для исходного и сжатого представлений.
+        etag = f'W/"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+        last_modified = _http_date(stat.st_mtime)
+        headers = self.headers(path, etag, last_modified)
+
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            not_modified = etag in if_none_match or if_none_match == '*'
+        else:
+            not_modified = _not_modified_since(
+                environ.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime)
+        if not_modified:
+            start_response('304 Not Modified', headers)
+            return []
+
+        # If-Range сравнивает валидаторы строго, а слабый ETag строгое
+        # сравнение не проходит: с ETag в If-Range отдаётся весь файл.
+        if_range = environ.get('HTTP_IF_RANGE')
+        byte_range = None
+        if if_range is None or if_range == last_modified:
+            byte_range = _parse_range(environ.get('HTTP_RANGE'), stat.st_size)
+        if byte_range is False:
+            start_response('416 Range Not Satisfiable', headers + [
+                ('Content-Range', f'bytes */{stat.st_size}')])
+            return []
+
+        status, length, file = '200 OK', stat.st_size, None
+        if byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            status = '206 Partial Content'
+            headers.append(
+                ('Content-Range', f'bytes {start}-{end}/{stat.st_size}'))
+            file = _FileRange(open(path, 'rb'), start, length)
+        else:
+            headers.append(('Vary', 'Accept-Encoding'))
+            path, encoding = self.negotiate(environ, path)
+            if encoding:
+                headers.append(('Content-Encoding', encoding))
+                length = os.path.getsize(path)
+        headers.append(('Content-Length', str(length)))
+        start_response(status, headers)
+
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            if file is not None:
+                file.close()
+            return []
+        if file is None:
+            file = open(path, 'rb')
+        wrapper = environ.get('wsgi.file_wrapper', FileWrapper)
+        return wrapper(file, BLOCK_SIZE)
+
+    def headers(self, path, etag, last_modified):
+        content_type, _ = mimetypes.guess_type(path)
+        max_age = (IMMUTABLE_MAX_AGE
+                   if IMMUTABLE_NAME.search(os.path.basename(path))
+                   else DEFAULT_MAX_AGE)
+        headers = [
+            ('Content-Type', content_type or 'application/octet-stream'),
+            ('Cache-Control', f'public, max-age={max_age}'
+             + (', immutable' if max_age == IMMUTABLE_MAX_AGE else '')),
+            ('Last-Modified', last_modified),
+            ('ETag', etag),
+            ('Accept-Ranges', 'bytes'),
+        ]
+        # Как SecurityMiddleware для ответов Django.
+        if settings.SECURE_CONTENT_TYPE_NOSNIFF:
+            headers.append(('X-Content-Type-Options', 'nosniff'))
+        return headers
+
+    def negotiate(self, environ, path):
+        accepted = environ.get('HTTP_ACCEPT_ENCODING', '')
+        for encoding, suffix in ENCODINGS:
+            if encoding in accepted and os.path.isfile(path + suffix):
+                return path + suffix, encoding
+        return path, None
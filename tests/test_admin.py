@@ -0,0 +1,90 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def _changelist_queries(admin_client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(url)
+    assert response.status_code == 200
+    return len(queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/admin/blog/post/", "/admin/auth/user/"])
+def test_changelist_queries_do_not_grow_with_rows(
+        admin_client, mixer, user, published_category,
+        published_location, url):
+    def add_posts(count):
+        mixer.cycle(count).blend(
+            "blog.Post", author=mixer.blend("auth.User"),
+            category=published_category, location=published_location)
+
+    add_posts(2)
+    few = _changelist_queries(admin_client, url)
+    add_posts(20)
+    assert _changelist_queries(admin_client, url) == few
+
+
+@pytest.mark.django_db
+def test_user_changelist_shows_post_counts(admin_client, mixer, user):
+    mixer.cycle(3).blend("blog.Post", author=user)
+    response = admin_client.get("/admin/auth/user/", {"o": "-3"})
+    users = list(response.context["cl"].result_list)
+    assert users[0] == user
+    assert users[0].num_posts == 3
+
+
+@pytest.mark.django_db
+def test_location_inline_is_limited(admin_client, mixer, published_location):
+    from blog.constants import ADMIN_INLINE_POSTS
+
+    mixer.cycle(ADMIN_INLINE_POSTS + 5).blend(
+        "blog.Post", location=published_location)
+    response = admin_client.get(
+        f"/admin/blog/location/{published_location.id}/change/")
+    formset = response.context["inline_admin_formsets"][0].formset
+    assert len(formset.forms) == ADMIN_INLINE_POSTS
+
+
+@pytest.mark.django_db
+def test_estimated_count_paginator(monkeypatch, mixer):
+    from blog.models import Post
+    from core import paginator
+
+    mixer.cycle(3).blend("blog.Post")
+    monkeypatch.setattr(paginator, "estimate_count", lambda *args: 10 ** 6)
+    assert paginator.EstimatedCountPaginator(
+        Post.objects.all(), 10).count == 10 ** 6
+    assert paginator.EstimatedCountPaginator(
+        Post.objects.filter(is_published=True), 10).count == 3
+
+    monkeypatch.setattr(paginator, "estimate_count", lambda *args: 5)
+    assert paginator.EstimatedCountPaginator(
+        Post.objects.all(), 10).count == 3
+
+
+@pytest.mark.django_db
+def test_estimate_count_reads_sqlite_statistics(mixer):
+    from blog.models import Post
+    from core.db import estimate_count
+
+    mixer.cycle(4).blend("blog.Post")
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    assert estimate_count(Post, "default") == 4
+
+
+@pytest.mark.django_db
+def test_post_changelist_search_uses_index(admin_client, mixer):
+    match = mixer.blend("blog.Post", title="пингвины", text="текст")
+    mixer.blend("blog.Post", title="жирафы", text="текст")
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get("/admin/blog/post/", {"q": "пингв"})
+    assert list(response.context["cl"].result_list) == [match]
+    matching = [query["sql"] for query in queries if "MATCH" in query["sql"]]
+    assert matching, "Поиск в админке идёт через индекс FTS."
+    for sql in matching:
+        assert sql.count("MATCH") == 1 and "bm25" not in sql, (
+            "Списку в админке нужен только отбор по индексу, без ранга."
+        )
@@ -0,0 +1,97 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def api_posts(mixer, user, published_category, published_location):
+    return mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location)
+
+
+@pytest.mark.django_db
+def test_post_list_sparse_fields(client, api_posts):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/v1/posts/", {"fields": "id,title,author"})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0].keys() == {"id", "title", "author"}
+    assert results[0]["author"] == api_posts[0].author.username
+    post_queries = [q["sql"] for q in queries.captured_queries
+                    if 'FROM "blog_post"' in q["sql"]]
+    assert post_queries
+    assert not any('"blog_post"."text"' in sql for sql in post_queries), (
+        "Незапрошенный текст поста не читается из БД."
+    )
+
+    response = client.get("/api/v1/posts/", {"fields": "id,password"})
+    assert response.status_code == 400
+    assert "password" in response.json()["error"]
+
+
+@pytest.mark.django_db
+def test_post_list_keyset_pagination(client, api_posts):
+    first = client.get("/api/v1/posts/", {"limit": 3}).json()
+    second = client.get(
+        "/api/v1/posts/", {"limit": 3, "cursor": first["next"]}).json()
+    ids = [post["id"] for post in first["results"] + second["results"]]
+    expected = sorted(api_posts, key=lambda p: (p.pub_date, p.id),
+                      reverse=True)
+    assert ids == [post.id for post in expected]
+    assert second["next"] is None
+    assert client.get(
+        "/api/v1/posts/", {"cursor": "не-курсор"}).status_code == 400
+    for limit in (1000, 0, "²", "x"):
+        assert client.get(
+            "/api/v1/posts/", {"limit": limit}).status_code == 400, limit
+
+
+@pytest.mark.django_db
+def test_category_and_profile_posts(
+        client, user_client, mixer, user, api_posts):
+    post = api_posts[0]
+    hidden = mixer.blend(
+        "blog.Post", author=user, category=post.category,
+        is_published=False)
+
+    response = client.get(f"/api/v1/categories/{post.category.slug}/posts/")
+    assert len(response.json()["results"]) == len(api_posts)
+
+    url = f"/api/v1/profiles/{user.username}/posts/"
+    ids = [p["id"] for p in client.get(url).json()["results"]]
+    assert hidden.id not in ids
+    ids = [p["id"] for p in user_client.get(url).json()["results"]]
+    assert hidden.id in ids
+
+    profile = client.get(f"/api/v1/profiles/{user.username}/").json()
+    assert profile["post_count"] == len(api_posts)
+    assert client.get("/api/v1/profiles/nobody/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_post_detail_and_comments(client, user_client, mixer, api_posts):
+    post = api_posts[0]
+    comments = mixer.cycle(2).blend("blog.Comment", post=post)
+    response = client.get(f"/api/v1/posts/{post.id}/")
+    assert response.json()["text"] == post.text
+
+    response = client.get(f"/api/v1/posts/{post.id}/comments/")
+    assert [c["id"] for c in response.json()["results"]] == [
+        c.id for c in comments]
+
+    post.is_published = False
+    post.save()
+    response = client.get(f"/api/v1/posts/{post.id}/")
+    assert response.status_code == 404
+    assert response.json() == {"error": "Не найдено"}
+    assert user_client.get(f"/api/v1/posts/{post.id}/").status_code == 200
+
+
+@pytest.mark.django_db
+def test_api_not_modified(client, api_posts):
+    response = client.get("/api/v1/posts/")
+    assert client.get(
+        "/api/v1/posts/", HTTP_IF_NONE_MATCH=response["ETag"]
+    ).status_code == 304
+    assert client.post("/api/v1/posts/").status_code == 405
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+
+@pytest.fixture
+def async_urls(settings):
+    settings.ROOT_URLCONF = "blogicum.asgi_urls"
+
+
+@pytest.fixture
+def aget(async_urls):
+    client = AsyncClient()
+
+    async def get(path, **extra):
+        return await client.get(path, **extra)
+    return async_to_sync(get)
+
+
+def test_async_views_are_routed(async_urls):
+    from django.urls import resolve
+
+    for path in ("/", "/category/slug/", "/profile/name/", "/posts/1/"):
+        assert asyncio.iscoroutinefunction(resolve(path).func), path
+    assert not asyncio.iscoroutinefunction(resolve("/search/").func)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_pages_render(aget, mixer, post_with_published_location):
+    post = post_with_published_location
+    hidden = mixer.blend(
+        "blog.Post", author=post.author, category=post.category,
+        is_published=False)
+    pages = (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+        f"/posts/{post.id}/",
+    )
+    for url in pages:
+        response = aget(url)
+        assert response.status_code == 200, url
+        content = response.content.decode()
+        assert post.title in content, url
+        assert hidden.title not in content, url
+    assert aget(f"/posts/{hidden.id}/").status_code == 404
+    assert aget("/profile/nobody/").status_code == 404
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_pages_are_cached_and_conditional(
+        aget, post_with_published_location):
+    post = post_with_published_location
+    url = f"/category/{post.category.slug}/"
+    # Первый ответ выдаёт CSRF-cookie, которая входит в ETag.
+    aget(url)
+    response = aget(url)
+    # AsyncClient в Django 3.2 передаёт extra как заголовки ASGI.
+    headers = {"if-none-match": response["ETag"]}
+    assert aget(url, **headers).status_code == 304
+    assert aget(url).content == response.content
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_db_workers_setting(settings):
+    from core.asyncdb import get_executors
+
+    settings.ASYNC_DB_WORKERS = 3
+    assert len(get_executors()) == 3
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_request_reuses_one_connection(
+        async_urls, monkeypatch, user_client, post_with_published_location):
+    import threading
+
+    from django.db.backends.signals import connection_created
+
+    from core import asyncdb
+
+    opened, closed = [], []
+    close_old_connections = asyncdb.close_old_connections
+
+    def on_connect(sender, connection, **kwargs):
+        opened.append(threading.current_thread().name)
+
+    def close():
+        closed.append(threading.current_thread().name)
+        close_old_connections()
+
+    monkeypatch.setattr(asyncdb, "close_old_connections", close)
+    client = AsyncClient()
+    client.cookies.update(user_client.cookies)
+
+    async def get(path):
+        return await client.get(path)
+
+    # Страница поста от пользователя: сессия, пост, комментарии и
+    # проверки кэша — несколько обращений к БД за запрос.
+    connection_created.connect(on_connect)
+    try:
+        response = async_to_sync(get)(
+            f"/posts/{post_with_published_location.id}/")
+    finally:
+        connection_created.disconnect(on_connect)
+    assert response.status_code == 200
+    for executor in asyncdb.get_executors():
+        executor.submit(lambda: None).result()
+    assert len(opened) == 1, "Запрос использует одно соединение потока БД."
+    assert closed == opened, (
+        "Соединения закрываются один раз за запрос в его потоке БД."
+    )
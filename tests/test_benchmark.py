@@ -0,0 +1,103 @@
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+
+@pytest.mark.django_db
+def test_benchmark_report(tmp_path):
+    output = tmp_path / "benchmark.json"
+    call_command("benchmark", seed_data=True, users=3, posts=20,
+                 comments=30, requests=2, output=str(output), verbosity=0)
+    report = json.loads(output.read_text())
+    assert report["dataset"] == {
+        "users": 3, "posts": 20, "comments": 30, "seed": 0}
+    assert set(report["scenarios"]) == {
+        "index", "category", "profile", "detail", "search",
+        "comment_create", "post_create"}
+    for result in report["scenarios"].values():
+        assert result["requests"] == 2
+        assert {"rps", "mean_ms", "p50_ms", "p99_ms"} <= result.keys()
+
+
+@pytest.mark.django_db
+def test_benchmark_anonymous_scenarios(tmp_path):
+    output = tmp_path / "benchmark.json"
+    call_command("benchmark", seed_data=True, users=3, posts=20,
+                 comments=0, requests=1, anonymous=True,
+                 scenario=["index", "detail", "post_create"],
+                 output=str(output), verbosity=0)
+    report = json.loads(output.read_text())
+    assert report["anonymous"] is True
+    assert set(report["scenarios"]) == {"index", "detail"}
+
+
+@pytest.mark.django_db
+def test_benchmark_without_data(tmp_path):
+    output = tmp_path / "benchmark.json"
+    with pytest.raises(CommandError, match="--seed-data"):
+        call_command("benchmark", requests=1, output=str(output),
+                     verbosity=0)
+    assert not output.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_asgi_report(tmp_path):
+    from blog import benchmark
+
+    benchmark.seed(3, 20, 30, log=lambda message: None)
+    output = tmp_path / "benchmark_asgi.json"
+    call_command("benchmark_asgi", requests=8, concurrency=4, workers=2,
+                 output=str(output), verbosity=0)
+    report = json.loads(output.read_text())
+    assert (report["requests"], report["concurrency"]) == (8, 4)
+    for server in ("wsgi", "asgi"):
+        summary = report["servers"][server]
+        assert summary["errors"] == 0, server
+        assert summary["ops"] == 8
+        assert {"ops_per_s", "p50_ms", "p99_ms"} <= summary.keys()
+
+
+@pytest.mark.django_db
+def test_benchmark_asgi_without_data(tmp_path):
+    with pytest.raises(CommandError, match="--seed-data"):
+        call_command("benchmark_asgi", requests=1,
+                     output=str(tmp_path / "out.json"), verbosity=0)
+
+
+@pytest.fixture
+def restore_database_settings():
+    from django.db import connections
+
+    database = connections.databases["default"]
+    saved = dict(database)
+    yield
+    database.clear()
+    database.update(saved)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_concurrency_report(tmp_path, restore_database_settings):
+    from blog import benchmark
+
+    benchmark.seed(3, 20, 30, log=lambda message: None)
+    output = tmp_path / "benchmark_concurrency.json"
+    call_command("benchmark_concurrency", profiles=["development"],
+                 duration=0.3, readers=2, writers=1, output=str(output),
+                 verbosity=0)
+    report = json.loads(output.read_text())
+    assert (report["readers"], report["writers"]) == (2, 1)
+    result = report["profiles"]["development"]
+    assert set(result) == {"read", "write"}
+    assert result["read"]["ops"] > 0
+    for summary in result.values():
+        assert {"ops", "ops_per_s", "errors"} <= summary.keys()
+
+
+@pytest.mark.django_db
+def test_benchmark_concurrency_without_data(
+        tmp_path, restore_database_settings):
+    with pytest.raises(CommandError, match="--seed-data"):
+        call_command("benchmark_concurrency", profiles=["development"],
+                     duration=0.1, output=str(tmp_path / "out.json"),
+                     verbosity=0)
@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.cache import feed_cache_timeout, page_cache_stats, post_card_stats
+
+
+@pytest.mark.django_db
+def test_post_card_cache_hits_and_invalidation(
+        user_client, client, mixer, post_with_published_location):
+    post = post_with_published_location
+
+    user_client.get("/")
+    assert post_card_stats() == {"post_card_hits": 0, "post_card_misses": 1}
+    user_client.get("/")
+    assert post_card_stats() == {"post_card_hits": 1, "post_card_misses": 1}
+
+    post.title = "Новый заголовок карточки"
+    post.save()
+    assert post.title in client.get("/").content.decode(), (
+        "Убедитесь, что изменение поста сбрасывает кэш его карточки."
+    )
+
+    post.category.title = "Новая категория карточки"
+    post.category.save()
+    assert post.category.title in client.get("/").content.decode(), (
+        "Убедитесь, что изменение категории сбрасывает кэш карточек."
+    )
+
+    mixer.blend("blog.Comment", post=post)
+    assert "Комментарии (1)" in client.get("/").content.decode()
+
+
+@pytest.mark.django_db
+def test_anonymous_feed_page_cache(client, user_client, mixer,
+                                   post_with_published_location):
+    post = post_with_published_location
+    for url in ("/", f"/category/{post.category.slug}/"):
+        client.get(url)
+        client.get(url, {"page": 1})
+        client.get(url)
+    assert page_cache_stats() == {"page_hits": 2, "page_misses": 4}
+
+    user_client.get("/")
+    assert page_cache_stats()["page_hits"] == 2, (
+        "Авторизованным пользователям страницы из кэша не отдаются."
+    )
+
+    new_post = mixer.blend(
+        "blog.Post", category=post.category, is_published=True,
+        pub_date=timezone.now() - timedelta(minutes=1),
+    )
+    assert new_post.title in client.get("/").content.decode(), (
+        "Убедитесь, что новый пост сбрасывает кэш страниц ленты."
+    )
+
+
+@pytest.mark.django_db
+def test_feed_cache_expires_at_scheduled_post(settings, mixer, user):
+    settings.FEED_CACHE_TIMEOUT = 600
+    assert feed_cache_timeout() == 600
+    mixer.blend(
+        "blog.Post", author=user, is_published=True,
+        pub_date=timezone.now() + timedelta(seconds=90),
+    )
+    assert 0 < feed_cache_timeout() <= 90, (
+        "Кэш ленты должен истекать к моменту отложенной публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_publication_horizon_signal(mixer, user):
+    from blog import publication
+
+    post = mixer.blend(
+        "blog.Post", author=user, is_published=True,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+    assert publication.get_horizon() == post.pub_date
+
+    received = []
+
+    def receiver(sender, horizon, **kwargs):
+        received.append(horizon)
+
+    publication.deferred_posts_published.connect(receiver)
+    try:
+        passed = timezone.now() - timedelta(seconds=1)
+        publication.cache.set(publication.HORIZON_KEY, (passed, ), None)
+        assert publication.refresh_horizon() == post.pub_date
+        publication.cache.set(publication.HORIZON_KEY, (passed, ), None)
+        publication.refresh_horizon()
+    finally:
+        publication.deferred_posts_published.disconnect(receiver)
+    assert received == [passed], (
+        "Сигнал о наступлении отложенной публикации отправляется один раз."
+    )
+
+
+@pytest.mark.django_db
+def test_comment_invalidates_again_after_commit(
+        mixer, user, post_with_published_location,
+        django_capture_on_commit_callbacks):
+    from django.db import transaction
+
+    from blog.cache import FEEDS, post_version_name
+    from core.cache import get_versions
+
+    names = (post_version_name(post_with_published_location.id), FEEDS)
+    before = get_versions(*names)
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            mixer.blend(
+                "blog.Comment", post=post_with_published_location,
+                author=user)
+            # Параллельный читатель здесь ещё видит старые данные
+            # и может закэшировать их под новыми версиями.
+            during = get_versions(*names)
+    after = get_versions(*names)
+    assert all(b != d for b, d in zip(before, during)), (
+        "Транзакция сразу видит собственные изменения."
+    )
+    assert all(d != a for d, a in zip(during, after)), (
+        "После фиксации версии сбрасываются ещё раз."
+    )
@@ -0,0 +1,69 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.fixture
+def past():
+    return timezone.now() - timedelta(days=1)
+
+
+@pytest.mark.django_db
+def test_queryset_update_touches_updated_at(mixer, past):
+    from blog.models import Category
+
+    category = mixer.blend("blog.Category")
+    Category.objects.filter(pk=category.pk).update(updated_at=past)
+
+    Category.objects.filter(pk=category.pk).update(is_published=False)
+    category.refresh_from_db()
+    assert category.updated_at > past
+
+    Category.objects.filter(pk=category.pk).update(
+        is_published=True, updated_at=past)
+    category.refresh_from_db()
+    assert category.updated_at == past, (
+        "Явно заданное updated_at не перезаписывается."
+    )
+
+    category.title = "Новое название"
+    category.save(update_fields=["title"])
+    category.refresh_from_db()
+    assert category.updated_at > past
+
+
+@pytest.mark.django_db
+def test_changed_since_orders_by_modification(mixer, past):
+    from blog.models import Location
+
+    first, second, untouched = mixer.cycle(3).blend("blog.Location")
+    Location.objects.update(updated_at=past - timedelta(days=1))
+    moment = timezone.now()
+    second.save()
+    first.save()
+    assert list(Location.objects.changed_since(moment)) == [second, first]
+
+
+@pytest.mark.django_db
+def test_export_changed_since(
+        mixer, past, post_with_published_location):
+    from blog.models import Category, Comment, Location, Post
+
+    mixer.cycle(2).blend("blog.Comment", post=post_with_published_location)
+    for model in (Category, Location, Post, Comment):
+        model.objects.update(updated_at=past)
+    moment = timezone.now()
+    comment = Comment.objects.first()
+    comment.text = "Изменённый комментарий"
+    comment.save()
+
+    output = StringIO()
+    call_command("export_ndjson", changed_since=moment.isoformat(),
+                 stdout=output, stderr=StringIO())
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [(r["model"], r["pk"]) for r in records] == [
+        ("blog.comment", comment.pk)]
@@ -0,0 +1,43 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_views(user_client, post_with_published_location):
+    post = post_with_published_location
+    assert post.comment_count == 0
+
+    for i in range(3):
+        user_client.post(
+            f"/posts/{post.id}/comment/", data={"text": f"Комментарий {i}"})
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что создание комментария увеличивает `comment_count`."
+    )
+
+    comment = post.comments.first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что удаление комментария уменьшает `comment_count`."
+    )
+
+
+@pytest.mark.django_db
+def test_comment_count_bulk_delete(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(4).blend("blog.Comment", post=post)
+    post.comments.all().delete()
+    post.refresh_from_db()
+    assert post.comment_count == 0
+
+
+@pytest.mark.django_db
+def test_recount_comments_repairs_drift(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=7)
+
+    call_command("recount_comments", verbosity=0)
+    post.refresh_from_db()
+    assert post.comment_count == 2
@@ -0,0 +1,126 @@
+import pytest
+
+
+def _revalidate(client, url, response, **headers):
+    return client.get(url, HTTP_IF_NONE_MATCH=response["ETag"], **headers)
+
+
+@pytest.mark.django_db
+def test_post_detail_not_modified(
+        client, mixer, user, post_with_published_location,
+        django_assert_num_queries):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    response = client.get(url)
+    assert response.status_code == 200
+    assert "Last-Modified" in response
+
+    # Время изменения уже в кэше: без запросов и построения контекста.
+    with django_assert_num_queries(0):
+        not_modified = _revalidate(client, url, response)
+    assert not_modified.status_code == 304
+    assert not_modified["ETag"] == response["ETag"]
+    assert client.get(
+        url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    ).status_code == 304
+
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    response = _revalidate(client, url, response)
+    assert response.status_code == 200
+
+    comment.text = "Исправленный комментарий"
+    comment.save()
+    response = _revalidate(client, url, response)
+    assert response.status_code == 200
+    assert comment.text in response.content.decode()
+
+    comment.delete()
+    assert _revalidate(client, url, response).status_code == 200
+
+
+@pytest.mark.django_db
+def test_conditional_response_depends_on_viewer(
+        client, user_client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    anonymous = client.get(url)
+    # Первый ответ выдаёт CSRF-cookie, которая входит в ETag.
+    user_client.get(url)
+    response = user_client.get(url)
+    assert "Last-Modified" not in response
+    assert response["ETag"] != anonymous["ETag"]
+    assert _revalidate(user_client, url, anonymous).status_code == 200
+    assert _revalidate(user_client, url, response).status_code == 304
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page", ["index", "category", "profile"])
+def test_feeds_not_modified(
+        client, user, post_with_published_location,
+        django_assert_num_queries, page):
+    post = post_with_published_location
+    url = {
+        "index": "/",
+        "category": f"/category/{post.category.slug}/",
+        "profile": f"/profile/{user.username}/",
+    }[page]
+    response = client.get(url)
+    with django_assert_num_queries(0):
+        assert _revalidate(client, url, response).status_code == 304
+
+    post.title = "Новый заголовок"
+    post.save()
+    response = _revalidate(client, url, response)
+    assert response.status_code == 200
+    assert post.title in response.content.decode()
+
+    post.delete()
+    assert _revalidate(client, url, response).status_code == 200
+
+
+@pytest.mark.django_db
+def test_feeds_last_modified_without_posts(mixer):
+    from blog.conditional import feeds_last_modified
+
+    assert feeds_last_modified(None) is None
+    # Сохранение категории сбрасывает поколение лент и их кэш.
+    category = mixer.blend("blog.Category")
+    assert feeds_last_modified(None) == category.updated_at, (
+        "Изменения категорий учитываются и без единого поста."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page", ["index", "category"])
+def test_feeds_revalidate_after_scheduled_post(
+        client, user_client, mixer, user, published_category, page):
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from blog import publication
+    from blog.models import Post
+
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(hours=1))
+    url = {
+        "index": "/",
+        "category": f"/category/{published_category.slug}/",
+    }[page]
+    # Первый ответ выдаёт CSRF-cookie, которая входит в ETag.
+    user_client.get(url)
+    response = user_client.get(url)
+    anonymous = client.get(url)
+    assert post.title not in response.content.decode()
+
+    # Время публикации наступило: запись в БД при этом не происходит.
+    passed = timezone.now() - timedelta(seconds=1)
+    Post.objects.filter(pk=post.pk).update(pub_date=passed)
+    publication.cache.set(publication.HORIZON_KEY, (passed, ), None)
+
+    revalidated = _revalidate(user_client, url, response)
+    assert revalidated.status_code == 200, (
+        "Наступившая публикация сбрасывает ETag лент и для пользователей."
+    )
+    assert post.title in revalidated.content.decode()
+    assert _revalidate(client, url, anonymous).status_code == 200
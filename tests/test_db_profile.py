@@ -0,0 +1,44 @@
+import sqlite3
+
+import pytest
+from django.db import connections, transaction
+
+ALIAS = "production"
+
+
+@pytest.fixture
+def production_db(settings, tmp_path, django_db_blocker):
+    path = tmp_path / "db.sqlite3"
+    connections.databases[ALIAS] = {
+        **connections["default"].settings_dict,
+        **settings.SQLITE_PRODUCTION_DATABASE,
+        "NAME": str(path),
+    }
+    with django_db_blocker.unblock():
+        yield connections[ALIAS], path
+        connections[ALIAS].close()
+    del connections[ALIAS]
+    del connections.databases[ALIAS]
+
+
+def test_production_profile_pragmas(production_db):
+    connection, _ = production_db
+    pragmas = {}
+    with connection.cursor() as cursor:
+        for name in ("journal_mode", "synchronous", "busy_timeout"):
+            cursor.execute(f"PRAGMA {name}")
+            pragmas[name] = cursor.fetchone()[0]
+    assert pragmas == {
+        "journal_mode": "wal", "synchronous": 1, "busy_timeout": 5000
+    }
+
+
+def test_production_profile_takes_write_lock_on_begin(production_db):
+    _, path = production_db
+    other = sqlite3.connect(path, timeout=0, isolation_level=None)
+    try:
+        with transaction.atomic(using=ALIAS):
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                other.execute("BEGIN IMMEDIATE")
+    finally:
+        other.close()
@@ -0,0 +1,105 @@
+import gzip
+import io
+import json
+
+import pytest
+from django.conf import settings
+from django.contrib.auth.models import Permission
+from django.core.management import CommandError, call_command
+
+from blog.models import Category, Post
+from core.streaming import iter_json_array, iter_json_lines
+
+DB_FIXTURE = settings.BASE_DIR / "db.json"
+
+
+def _load(*paths):
+    call_command("fast_loaddata", *map(str, paths), stdout=io.StringIO())
+
+
+def _category(pk, slug):
+    return {"model": "blog.category", "pk": pk, "fields": {
+        "title": slug, "description": slug, "slug": slug,
+        "is_published": True, "created_at": "2020-01-01T00:00:00Z"}}
+
+
+@pytest.mark.django_db
+def test_loads_repo_fixture_over_migrated_database():
+    # migrate уже создал права и типы содержимого: их строки обновляются.
+    assert Permission.objects.exists()
+    _load(DB_FIXTURE)
+
+    fixture = json.loads(DB_FIXTURE.read_text(encoding="utf-8"))
+    posts = {row["pk"]: row["fields"]
+             for row in fixture if row["model"] == "blog.post"}
+    assert Post.objects.count() == len(posts)
+    for post in Post.objects.filter(pk__in=list(posts)[:5]):
+        expected = posts[post.pk]
+        assert post.title == expected["title"]
+        assert post.author_id == expected["author"]
+        assert post.category_id == expected["category"]
+    permission = next(row for row in fixture
+                      if row["model"] == "auth.permission")
+    assert Permission.objects.get(
+        pk=permission["pk"]).codename == permission["fields"]["codename"]
+
+
+@pytest.mark.django_db
+def test_existing_rows_are_updated(tmp_path):
+    path = tmp_path / "categories.ndjson.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as stream:
+        stream.write(json.dumps(_category(100, "first")) + "\n")
+    _load(path)
+    with gzip.open(path, "wt", encoding="utf-8") as stream:
+        stream.write(json.dumps(_category(100, "second")) + "\n")
+    _load(path)
+    assert list(Category.objects.values_list("pk", "slug")) == [
+        (100, "second")]
+
+
+@pytest.mark.django_db
+def test_broken_reference_rolls_back(tmp_path, user):
+    post = {"model": "blog.post", "pk": 7, "fields": {
+        "title": "t", "text": "t", "pub_date": "2020-01-01T00:00:00Z",
+        "author": user.pk, "category": 404, "is_published": True,
+        "created_at": "2020-01-01T00:00:00Z"}}
+    path = tmp_path / "broken.json"
+    path.write_text(json.dumps([_category(1, "kept"), post]))
+    with pytest.raises(CommandError, match="целостность"):
+        _load(path)
+    assert not Category.objects.exists()
+    assert not Post.objects.exists()
+
+
+@pytest.mark.django_db
+def test_sequences_follow_loaded_keys(tmp_path):
+    path = tmp_path / "categories.json"
+    path.write_text(json.dumps([_category(100, "loaded")]))
+    _load(path)
+    created = Category.objects.create(
+        title="new", description="new", slug="new")
+    assert created.pk > 100
+
+
+@pytest.mark.django_db
+def test_missing_fixture():
+    with pytest.raises(CommandError, match="не найден"):
+        _load("missing.json")
+
+
+def test_iter_json_array_across_chunks():
+    items = [{"text": "a, ] [ \" }", "n": i} for i in range(20)]
+    stream = io.StringIO(" \n" + json.dumps(items, indent=1))
+    assert list(iter_json_array(stream, chunk_size=7)) == items
+    assert list(iter_json_array(io.StringIO("[ ]"))) == []
+
+
+@pytest.mark.parametrize("text", ['{"a": 1}', '[{"a": 1}', '[{"a": 1'])
+def test_iter_json_array_rejects_broken_input(text):
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(text), chunk_size=4))
+
+
+def test_iter_json_lines_skips_blank_lines():
+    stream = io.StringIO('{"a": 1}\n\n  \n{"a": 2}\n')
+    assert list(iter_json_lines(stream)) == [{"a": 1}, {"a": 2}]
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+
+def _feed_urls(post):
+    return [
+        "/feeds/rss/",
+        "/feeds/atom/",
+        f"/category/{post.category.slug}/rss/",
+        f"/category/{post.category.slug}/atom/",
+        f"/profile/{post.author.username}/rss/",
+        f"/profile/{post.author.username}/atom/",
+    ]
+
+
+@pytest.mark.django_db
+def test_feeds_list_published_posts(
+        client, mixer, post_with_published_location):
+    post = post_with_published_location
+    hidden = mixer.blend(
+        "blog.Post", author=post.author, category=post.category,
+        is_published=False)
+    deferred = mixer.blend(
+        "blog.Post", author=post.author, category=post.category,
+        pub_date=timezone.now() + timedelta(days=1))
+    for url in _feed_urls(post):
+        response = client.get(url)
+        assert response.status_code == 200, url
+        content = response.content.decode()
+        assert post.title in content
+        assert hidden.title not in content
+        assert deferred.title not in content
+    assert "<rss" in client.get("/feeds/rss/").content.decode()
+    assert "<feed" in client.get("/feeds/atom/").content.decode()
+
+
+@pytest.mark.django_db
+def test_feeds_for_missing_objects(client, mixer):
+    hidden = mixer.blend("blog.Category", is_published=False)
+    assert client.get(f"/category/{hidden.slug}/rss/").status_code == 404
+    assert client.get("/profile/nobody/atom/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_feed_polling_gets_not_modified(
+        client, post_with_published_location, django_assert_num_queries):
+    post = post_with_published_location
+    url = f"/category/{post.category.slug}/atom/"
+    response = client.get(url)
+    with django_assert_num_queries(0):
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code == 304
+        assert client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        ).status_code == 304
+        # Без условных заголовков лента отдаётся из кэша страниц.
+        assert client.get(url).content == response.content
+
+    post.title = "Обновлённый заголовок"
+    post.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 200
+    assert post.title in response.content.decode()
@@ -0,0 +1,63 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+
+def _upload(name="photo.jpg", size=(800, 600)):
+    buffer = BytesIO()
+    Image.new("RGB", size, "teal").save(buffer, "JPEG")
+    return SimpleUploadedFile(name, buffer.getvalue(), "image/jpeg")
+
+
+@pytest.mark.django_db
+def test_post_form_builds_image_variants(
+        settings, user, user_client, mixer,
+        django_capture_on_commit_callbacks):
+    from blog.models import Post
+
+    settings.IMAGE_PROCESSING_WORKERS = 0
+    category = mixer.blend("blog.Category", is_published=True)
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post("/posts/create/", {
+            "title": "С картинкой", "text": "Текст",
+            "pub_date": "2020-01-01T10:00", "category": category.id,
+            "is_published": True,
+            "image": _upload(),
+        })
+    post = Post.objects.get(author=user)
+
+    meta = post.image_meta
+    assert meta["source"] == post.image.name
+    assert (meta["width"], meta["height"]) == (800, 600)
+    variants = dict(meta["variants"])
+    assert "image/webp" in variants
+    assert [width for width, _, _ in variants["image/jpeg"]] == [
+        320, 640, 800
+    ], "Копии не должны быть шире оригинала."
+
+    content = user_client.get(f"/posts/{post.id}/").content.decode()
+    assert 'type="image/webp"' in content
+    assert 'width="800" height="600"' in content
+    profile = user_client.get(f"/profile/{user.username}/")
+    assert 'loading="lazy"' in profile.content.decode()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_image_variants_built_in_process_pool(settings, mixer, user):
+    from blog import images
+
+    settings.IMAGE_PROCESSING_WORKERS = 1
+    post = mixer.blend(
+        "blog.Post", author=user, image=_upload(size=(200, 100)))
+    try:
+        meta = images.process_post_image(
+            post.id, post.image.name).result(timeout=60)
+    finally:
+        images.get_executor().shutdown()
+        images._reset_executor()
+
+    post.refresh_from_db()
+    assert post.image_meta == meta
+    assert dict(meta["variants"])["image/jpeg"][0][:2] == [200, 100]
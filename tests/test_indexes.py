@@ -0,0 +1,44 @@
+import pytest
+from django.db import connection
+
+from blog.models import Comment, Post
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="План запроса SQLite."),
+]
+
+
+def _assert_uses_index(queryset, index_name):
+    plan = queryset.explain()
+    assert f"USING INDEX {index_name}" in plan, (
+        f"Убедитесь, что запрос использует индекс `{index_name}`:\n{plan}"
+    )
+    assert "TEMP B-TREE" not in plan, (
+        f"Сортировка ленты должна идти по индексу, без временного "
+        f"B-дерева:\n{plan}"
+    )
+
+
+def test_index_feed_uses_index():
+    feed = Post.objects.posts_published().posts_annotate()
+    _assert_uses_index(feed[:10], "post_feed_idx")
+
+
+def test_author_feed_uses_index(user):
+    feed = Post.objects.posts_published().posts_annotate()
+    _assert_uses_index(feed.filter(author=user)[:10], "post_author_feed_idx")
+
+
+def test_category_feed_uses_index(published_category):
+    feed = Post.objects.posts_published().posts_annotate()
+    _assert_uses_index(
+        feed.filter(category=published_category)[:10],
+        "post_category_feed_idx",
+    )
+
+
+def test_post_comments_use_index(post_with_published_location):
+    comments = Comment.objects.filter(post=post_with_published_location)
+    _assert_uses_index(comments, "comment_post_created_idx")
@@ -0,0 +1,84 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category):
+    now = timezone.now()
+    # Попарно одинаковые даты проверяют устойчивость порядка по `id`.
+    pub_dates = (now - timedelta(hours=i // 2) for i in range(1, 26))
+    return mixer.cycle(25).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=pub_dates,
+    )
+
+
+def _walk(client, url):
+    seen, cursor, pages = [], "", 0
+    while True:
+        response = client.get(url, {"cursor": cursor})
+        assert response.status_code == HTTPStatus.OK
+        page_obj = response.context["page_obj"]
+        seen.extend(post.id for post in page_obj)
+        pages += 1
+        if not page_obj.has_next():
+            return seen, pages, page_obj
+        cursor = page_obj.next_cursor
+
+
+@pytest.mark.django_db
+def test_keyset_walk_matches_offset_order(client, feed_posts, user,
+                                          published_category):
+    expected = [
+        post.id for post in sorted(
+            feed_posts, key=lambda p: (p.pub_date, p.id), reverse=True)
+    ]
+    for url in (
+        "/",
+        f"/category/{published_category.slug}/",
+        f"/profile/{user.username}/",
+    ):
+        seen, pages, _ = _walk(client, url)
+        assert seen == expected, (
+            f"Убедитесь, что курсорная пагинация на странице `{url}` "
+            "проходит ленту без пропусков и повторов."
+        )
+        assert pages == 3
+
+
+@pytest.mark.django_db
+def test_keyset_previous_page(client, feed_posts):
+    first = client.get("/", {"cursor": ""}).context["page_obj"]
+    second = client.get(
+        "/", {"cursor": first.next_cursor}).context["page_obj"]
+    assert second.has_previous()
+    back = client.get(
+        "/", {"cursor": second.previous_cursor}).context["page_obj"]
+    assert [p.id for p in back] == [p.id for p in first]
+    assert not back.has_previous()
+    assert len(back) == N_PER_PAGE
+
+
+@pytest.mark.django_db
+def test_keyset_skips_count_query(client, feed_posts,
+                                  django_assert_max_num_queries):
+    with override_settings(KEYSET_PAGINATION=True):
+        with django_assert_max_num_queries(3) as captured:
+            client.get("/")
+    assert not any(
+        "COUNT(*)" in query["sql"].upper()
+        for query in captured.captured_queries
+    ), "Курсорная пагинация не должна выполнять COUNT(*)."
+
+
+@pytest.mark.django_db
+def test_keyset_invalid_cursor_falls_back(client, feed_posts):
+    response = client.get("/", {"cursor": "не-курсор"})
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.context["page_obj"]) == N_PER_PAGE
@@ -0,0 +1,106 @@
+import os
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+
+def _jpeg(color="teal"):
+    buffer = BytesIO()
+    Image.new("RGB", (64, 48), color).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def test_content_addressed_storage_deduplicates(tmp_path):
+    from core.storage import ContentAddressedStorage
+
+    storage = ContentAddressedStorage(location=tmp_path)
+    first = storage.save("post_imagine/a.JPG", ContentFile(b"same bytes"))
+    second = storage.save("post_imagine/b.jpg", ContentFile(b"same bytes"))
+    other = storage.save("post_imagine/a.jpg", ContentFile(b"other bytes"))
+
+    assert first == second != other
+    assert first.startswith("post_imagine/") and first.endswith(".jpg")
+    assert storage.open(first).read() == b"same bytes"
+    files = [name for _, _, names in os.walk(tmp_path) for name in names]
+    assert len(files) == 2, "Одинаковое содержимое хранится один раз."
+
+
+@pytest.mark.django_db
+def test_deleted_post_image_is_collected_when_unreferenced(
+        settings, user, user_client, mixer,
+        django_capture_on_commit_callbacks):
+    from blog.images import image_storage
+    from blog.models import Post
+
+    settings.IMAGE_PROCESSING_WORKERS = 0
+    category = mixer.blend("blog.Category", is_published=True)
+    with django_capture_on_commit_callbacks(execute=True):
+        for title in ("Первый", "Второй"):
+            user_client.post("/posts/create/", {
+                "title": title, "text": "Текст", "category": category.id,
+                "pub_date": "2020-01-01T10:00", "is_published": True,
+                "image": SimpleUploadedFile(
+                    f"{title}.jpg", _jpeg(), "image/jpeg"),
+            })
+    first, second = Post.objects.filter(author=user).order_by("id")
+    assert first.image.name == second.image.name
+    assert first.image_meta == second.image_meta
+    storage = image_storage()
+    variants = [name for _, items in first.image_meta["variants"]
+                for _, _, name in items]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post(f"/posts/{first.id}/delete/")
+    assert storage.exists(second.image.name), (
+        "Файл, на который ссылается другой пост, удалять нельзя."
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post(f"/posts/{second.id}/delete/")
+    assert not storage.exists(second.image.name)
+    assert not any(storage.exists(name) for name in variants)
+
+
+def test_release_returns_file_claimed_during_check(tmp_path):
+    from core.storage import ContentAddressedStorage
+
+    storage = ContentAddressedStorage(location=tmp_path)
+    name = storage.save("post_imagine/a.jpg", ContentFile(b"shared"))
+    # Ссылка появляется между первой и второй проверкой.
+    checks = iter((False, True))
+    assert not storage.release(name, lambda: next(checks))
+    assert storage.open(name).read() == b"shared"
+    files = [name for _, _, names in os.walk(tmp_path) for name in names]
+    assert len(files) == 1
+
+    assert storage.release(name, lambda: False)
+    assert not storage.exists(name)
+    assert not storage.release(name, lambda: False)
+
+
+@pytest.mark.django_db
+def test_upload_restores_image_released_before_commit(
+        settings, user, mixer, django_capture_on_commit_callbacks):
+    from blog.images import image_storage, release_image
+    from blog.models import Post
+
+    settings.IMAGE_PROCESSING_WORKERS = 0
+    storage = image_storage()
+    name = storage.save("post_imagine/old.jpg", ContentFile(_jpeg("navy")))
+    post = mixer.blend("blog.Post", author=user, image=None)
+    with django_capture_on_commit_callbacks(execute=True):
+        post.image = SimpleUploadedFile("new.jpg", _jpeg("navy"), "image/jpeg")
+        post.save()
+        assert post.image.name == name
+        # Освобождение старого поста успело удалить общий файл до
+        # фиксации новой ссылки.
+        storage.delete(name)
+    assert storage.exists(name), (
+        "Загрузка восстанавливает файл, удалённый параллельным release."
+    )
+    assert not release_image(name)
+    Post.objects.filter(pk=post.pk).delete()
+    assert release_image(name)
@@ -0,0 +1,104 @@
+import pytest
+
+
+def _profile(client, user):
+    response = client.get(f"/profile/{user.username}/")
+    assert response.status_code == 200
+    return response
+
+
+@pytest.mark.django_db
+def test_profile_queries_with_warm_cache(
+        another_user_client, user, post_with_published_location,
+        django_assert_num_queries):
+    _profile(another_user_client, user)
+    # Сессия, пользователь запроса и страница постов: шапка профиля
+    # и счётчик для пагинатора берутся из кэша.
+    with django_assert_num_queries(3):
+        response = _profile(another_user_client, user)
+    assert response.context["post_count"] == 1
+    assert response.context["profile"] == user
+
+
+@pytest.mark.django_db
+def test_profile_post_count_invalidation(
+        user_client, another_user_client, mixer, user,
+        post_with_published_location):
+    post = post_with_published_location
+    hidden = mixer.blend(
+        "blog.Post", author=user, category=post.category,
+        location=post.location, is_published=False)
+    assert _profile(user_client, user).context["post_count"] == 2
+    assert _profile(another_user_client, user).context["post_count"] == 1
+
+    hidden.is_published = True
+    hidden.save()
+    assert _profile(another_user_client, user).context["post_count"] == 2
+
+    post.category.is_published = False
+    post.category.save()
+    assert _profile(another_user_client, user).context["post_count"] == 0
+    assert _profile(user_client, user).context["post_count"] == 2
+
+    hidden.delete()
+    assert _profile(user_client, user).context["post_count"] == 1
+
+
+
+@pytest.mark.django_db
+def test_profile_post_count_after_author_change(
+        client, another_user, user, post_with_published_location):
+    post = post_with_published_location
+    assert _profile(client, user).context["post_count"] == 1
+    assert _profile(client, another_user).context["post_count"] == 0
+
+    post.author = another_user
+    post.save()
+    assert _profile(client, user).context["post_count"] == 0, (
+        "Прежний автор поста теряет его в счётчике профиля."
+    )
+    assert _profile(client, another_user).context["post_count"] == 1
+
+@pytest.mark.django_db
+def test_profile_header_invalidation(another_user_client, user):
+    _profile(another_user_client, user)
+    user.first_name = "Новое"
+    user.last_name = "Имя"
+    user.save()
+    assert "Новое Имя" in _profile(
+        another_user_client, user).content.decode()
+
+    old_username = user.username
+    user.username = "renamed_author"
+    user.save()
+    response = another_user_client.get(f"/profile/{old_username}/")
+    assert response.status_code == 404
+    _profile(another_user_client, user)
+
+
+@pytest.mark.django_db
+def test_user_saves_keep_unrelated_caches(
+        client, mixer, user, post_with_published_location):
+    from blog.cache import FEEDS, POST_CARDS, post_version_name
+    from core.cache import get_versions
+
+    post = post_with_published_location
+    names = (FEEDS, POST_CARDS, post_version_name(post.id))
+    versions = get_versions(*names)
+    mixer.blend("auth.User")
+    user.set_password("new-password")
+    user.save()
+    user.save(update_fields=["last_login"])
+    assert get_versions(*names) == versions, (
+        "Регистрация, вход и смена пароля не сбрасывают кэш карточек и лент."
+    )
+
+    user.username = "renamed_author"
+    user.save()
+    new_versions = get_versions(*names)
+    assert new_versions[1] == versions[1], (
+        "Переименование автора не сбрасывает карточки других авторов."
+    )
+    assert new_versions[0] != versions[0]
+    assert new_versions[2] != versions[2]
+    assert "@renamed_author" in client.get("/").content.decode()
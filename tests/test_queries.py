@@ -0,0 +1,75 @@
+import pytest
+
+
+def _detail_queries(client, post, django_assert_num_queries, expected):
+    with django_assert_num_queries(expected):
+        response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("n_comments", [1, 10])
+def test_post_detail_query_count(
+        client, mixer, post_with_published_location,
+        django_assert_num_queries, n_comments):
+    post = post_with_published_location
+    mixer.cycle(n_comments).blend("blog.Comment", post=post)
+    # Время изменения для Last-Modified, пост вместе с категорией,
+    # автором и локацией + комментарии с авторами.
+    _detail_queries(client, post, django_assert_num_queries, 3)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("n_comments", [1, 10])
+def test_post_detail_query_count_for_author(
+        user_client, mixer, post_with_published_location,
+        django_assert_num_queries, n_comments):
+    post = post_with_published_location
+    mixer.cycle(n_comments).blend("blog.Comment", post=post)
+    # Плюс сессия и пользователь запроса.
+    _detail_queries(user_client, post, django_assert_num_queries, 4)
+
+
+@pytest.mark.django_db
+def test_post_comments_are_paginated(
+        client, mixer, post_with_published_location):
+    from blog.constants import AMOUNT_COMMENTS
+
+    post = post_with_published_location
+    comments = mixer.cycle(AMOUNT_COMMENTS + 5).blend(
+        "blog.Comment", post=post)
+
+    page = client.get(f"/posts/{post.id}/").context["comments"]
+    assert [c.id for c in page] == [c.id for c in comments][:AMOUNT_COMMENTS]
+    assert page.has_next()
+
+    response = client.get(
+        f"/posts/{post.id}/comments/", {"cursor": page.next_cursor})
+    assert response.status_code == 200
+    rest = response.context["comments"]
+    assert [c.id for c in rest] == [c.id for c in comments][AMOUNT_COMMENTS:]
+    assert not rest.has_next()
+    assert f'name="comment_{comments[-1].id}"' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_performance_middleware_records_request(
+        client, post_with_published_location):
+    from core.instrumentation import recent_requests
+
+    client.get(f"/posts/{post_with_published_location.id}/")
+    entry = recent_requests()[-1]
+    assert entry["view"] == "blog:post_detail"
+    assert entry["queries"] == 3
+    assert entry["render_ms"] is not None
+    assert entry["sql_ms"] <= entry["total_ms"]
+
+
+@pytest.mark.django_db
+def test_performance_budget_enforced(
+        client, settings, post_with_published_location):
+    from core.instrumentation import QueryBudgetExceeded
+
+    settings.PERFORMANCE_BUDGETS = {"blog:post_detail": {"queries": 1}}
+    with pytest.raises(QueryBudgetExceeded):
+        client.get(f"/posts/{post_with_published_location.id}/")
@@ -0,0 +1,76 @@
+import pytest
+
+from core.routers import (PIN_COOKIE, ReplicaRouter, allow_replicas,
+                          routing_request)
+
+
+@pytest.fixture
+def replica_reads(settings, monkeypatch):
+    # Роль реплики играет тестовая база: проверяется только выбор.
+    settings.DATABASE_REPLICAS = ["default"]
+    chosen = []
+
+    def choose_replica(self, model, replicas):
+        chosen.append(model._meta.label)
+        return replicas[0]
+
+    monkeypatch.setattr(ReplicaRouter, "choose_replica", choose_replica)
+    return chosen
+
+
+def test_router_reads_from_replica_until_write(replica_reads):
+    from django.contrib.auth import get_user_model
+
+    from blog.models import Post
+
+    router = ReplicaRouter()
+    router.db_for_read(Post)
+    with routing_request():
+        router.db_for_read(Post)
+        allow_replicas()
+        router.db_for_read(Post)
+        router.db_for_read(get_user_model())
+        router.db_for_write(Post)
+        router.db_for_read(Post)
+    assert replica_reads == ["blog.Post"], (
+        "В реплику идут только разрешённые чтения моделей блога до записи."
+    )
+
+
+
+def test_cache_writes_keep_replica_reads(replica_reads):
+    from django.core.cache.backends.db import BaseDatabaseCache
+
+    from blog.models import Post
+
+    cache_entry = BaseDatabaseCache("blogicum_cache", {}).cache_model_class
+    router = ReplicaRouter()
+    with routing_request():
+        allow_replicas()
+        router.db_for_write(cache_entry)
+        router.db_for_read(Post)
+    assert replica_reads == ["blog.Post"], (
+        "Запись в общий кэш в базе не возвращает чтения в основную базу."
+    )
+
+@pytest.mark.django_db
+def test_read_views_use_replicas_and_writes_pin_author(
+        replica_reads, settings, user_client, post_with_published_location):
+    post = post_with_published_location
+    user_client.get(f"/posts/{post.id}/")
+    assert "blog.Post" in replica_reads
+
+    replica_reads.clear()
+    user_client.get(f"/posts/{post.id}/edit/")
+    assert replica_reads == [], "Формы редактирования читают основную базу."
+
+    response = user_client.post(
+        f"/posts/{post.id}/comment/", {"text": "Комментарий"})
+    assert replica_reads == []
+    cookie = response.cookies[PIN_COOKIE]
+    assert cookie["max-age"] == settings.REPLICA_STICKY_SECONDS
+
+    user_client.get(f"/posts/{post.id}/")
+    assert replica_reads == [], (
+        "После записи автор читает из основной базы, пока действует cookie."
+    )
@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+
+@pytest.fixture
+def searchable(mixer, user, published_category):
+    def blend(**kwargs):
+        kwargs.setdefault("title", "Заголовок")
+        kwargs.setdefault("text", "Текст")
+        kwargs.setdefault("is_published", True)
+        kwargs.setdefault("pub_date", timezone.now() - timedelta(days=1))
+        return mixer.blend(
+            "blog.Post", author=user, category=published_category, **kwargs)
+    return blend
+
+
+def _found(client, query, **params):
+    response = client.get("/search/", {"q": query, **params})
+    assert response.status_code == 200
+    return response.context["page_obj"]
+
+
+@pytest.mark.django_db
+def test_search_ranks_published_posts(client, searchable):
+    in_text = searchable(text="Рассказ про Байкал и нерпу")
+    in_title = searchable(title="Байкальская нерпа")
+    searchable(title="Байкал в черновике", is_published=False)
+    searchable(title="Байкал завтра",
+               pub_date=timezone.now() + timedelta(days=1))
+    searchable(title="Про горы")
+
+    page = _found(client, "нерп")
+    assert [post.id for post in page] == [in_title.id, in_text.id], (
+        "Поиск учитывает видимость постов и ставит совпадения в заголовке"
+        " выше."
+    )
+    assert list(_found(client, "")) == []
+    assert list(_found(client, '"байкал* -(')) != [], (
+        "Синтаксис FTS5 в запросе пользователя не должен ломать поиск."
+    )
+
+
+@pytest.mark.django_db
+def test_search_index_follows_post_changes(client, searchable):
+    post = searchable(title="Старое название")
+    assert list(_found(client, "старое")) == [post]
+
+    post.title = "Новое название"
+    post.save()
+    assert list(_found(client, "старое")) == []
+    assert list(_found(client, "новое")) == [post]
+
+    post.delete()
+    assert list(_found(client, "новое")) == []
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "backend", ["blog.search.SQLiteFTSBackend",
+                "blog.search.DatabaseSearchBackend"])
+def test_search_pagination(client, settings, searchable, backend):
+    settings.SEARCH_BACKEND = backend
+    # Регистр кириллицы в LIKE SQLite не учитывает только FTS5.
+    posts = [searchable(title=f"озеро {i}") for i in range(13)]
+
+    first = _found(client, "озеро")
+    assert len(first) == 10 and first.has_next()
+    response = client.get("/search/", {"q": "озеро"})
+    assert "q=%D0%BE%D0%B7%D0%B5%D1%80%D0%BE&amp;page=2" in (
+        response.content.decode()
+    ), "Ссылки пагинации сохраняют поисковый запрос."
+
+    rest = _found(client, "озеро", page=2)
+    found = [post.id for post in first] + [post.id for post in rest]
+    assert sorted(found) == sorted(post.id for post in posts)
+    assert not rest.has_next()
+
+
+@pytest.mark.django_db
+def test_search_matches_once_per_query(client, searchable):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    for i in range(5):
+        searchable(title=f"тайга {i}")
+    with CaptureQueriesContext(connection) as queries:
+        assert len(_found(client, "тайга")) == 5
+    matching = [query["sql"] for query in queries if "MATCH" in query["sql"]]
+    assert matching, "Поиск идёт через индекс FTS."
+    for sql in matching:
+        assert sql.count("MATCH") == 1, (
+            "Ранг присоединяется производной таблицей: MATCH выполняется"
+            " один раз, а не подзапросом на каждую строку."
+        )
+        assert "JOIN (SELECT rowid, bm25(" in sql
@@ -0,0 +1,97 @@
+import gzip
+from wsgiref.util import setup_testing_defaults
+
+import pytest
+from django.core.management import call_command
+
+
+def _fallback(environ, start_response):
+    start_response("404 Not Found", [])
+    return [b"django"]
+
+
+def _call(app, path, **headers):
+    environ = {"PATH_INFO": path, **headers}
+    setup_testing_defaults(environ)
+    response = {}
+
+    def start_response(status, response_headers):
+        response["status"] = int(status.split()[0])
+        response["headers"] = dict(response_headers)
+
+    response["body"] = b"".join(app(environ, start_response))
+    return response
+
+
+@pytest.fixture
+def static_app(tmp_path):
+    from core.wsgi import StaticMediaApplication
+
+    (tmp_path / "app.0123456789ab.css").write_bytes(b"body{}" * 100)
+    (tmp_path / "app.0123456789ab.css.gz").write_bytes(
+        gzip.compress(b"body{}" * 100))
+    (tmp_path / "robots.txt").write_bytes(b"0123456789")
+    return StaticMediaApplication(_fallback, [("/static/", tmp_path)])
+
+
+def test_static_app_serves_files_with_cache_headers(static_app):
+    response = _call(static_app, "/static/app.0123456789ab.css")
+    assert response["status"] == 200
+    assert response["body"] == b"body{}" * 100
+    assert "immutable" in response["headers"]["Cache-Control"]
+
+    compressed = _call(static_app, "/static/app.0123456789ab.css",
+                       HTTP_ACCEPT_ENCODING="gzip, deflate")
+    assert compressed["headers"]["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed["body"]) == b"body{}" * 100
+
+    etag = response["headers"]["ETag"]
+    cached = _call(static_app, "/static/robots.txt", HTTP_IF_NONE_MATCH=etag)
+    assert cached["status"] == 200, "ETag другого файла не совпадает."
+    etag = _call(static_app, "/static/robots.txt")["headers"]["ETag"]
+    assert _call(static_app, "/static/robots.txt",
+                 HTTP_IF_NONE_MATCH=etag)["status"] == 304
+
+    assert _call(static_app, "/static/missing.css")["body"] == b"django"
+    assert _call(static_app, "/static/../conftest.py")["body"] == b"django"
+
+
+@pytest.mark.parametrize("header, status, body", [
+    ("bytes=2-5", 206, b"2345"),
+    ("bytes=7-", 206, b"789"),
+    ("bytes=-3", 206, b"789"),
+    ("bytes=20-30", 416, b""),
+    ("bytes=0-1,4-5", 200, b"0123456789"),
+])
+def test_static_app_range_requests(static_app, header, status, body):
+    response = _call(static_app, "/static/robots.txt", HTTP_RANGE=header)
+    assert (response["status"], response["body"]) == (status, body)
+    if status == 206:
+        assert response["headers"]["Content-Length"] == str(len(body))
+
+
+def test_collectstatic_hashes_and_precompresses(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path
+    call_command("collectstatic", interactive=False, verbosity=0)
+
+    hashed = list(tmp_path.glob("css/bootstrap.min.*.css"))
+    assert len(hashed) == 1
+    assert hashed[0].with_name(hashed[0].name + ".gz").exists()
+    assert not list(tmp_path.glob("img/*.png.gz")), (
+        "Сжатые копии создаются только для текстовых форматов."
+    )
+
+
+def test_static_app_if_range_and_nosniff(static_app):
+    full = _call(static_app, "/static/robots.txt")
+    assert full["headers"]["X-Content-Type-Options"] == "nosniff"
+    headers = full["headers"]
+
+    weak = _call(static_app, "/static/robots.txt", HTTP_RANGE="bytes=2-5",
+                 HTTP_IF_RANGE=headers["ETag"])
+    assert (weak["status"], weak["body"]) == (200, b"0123456789"), (
+        "Слабый ETag не проходит строгое сравнение If-Range."
+    )
+    dated = _call(static_app, "/static/robots.txt", HTTP_RANGE="bytes=2-5",
+                  HTTP_IF_RANGE=headers["Last-Modified"])
+    assert (dated["status"], dated["body"]) == (206, b"2345")